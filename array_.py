@@ -1,10 +1,19 @@
-from typing import List, Optional, Dict, Any
-from helper import Contact
+import heapq
+from bisect import bisect_left
+from operator import attrgetter
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Set, Tuple
+from helper import (Contact, BulkInsertResult, BatchOperationsMixin, batch_delete_results, MemoryReport,
+                    PaginationMixin, ProbeLookupMixin, SortedView, dedupe_new_contacts)
+from indexes import SecondaryIndex, SecondaryIndexMixin
 
-class ArrayImpl:
-    def __init__(self):
+class ArrayImpl(SecondaryIndexMixin, BatchOperationsMixin, PaginationMixin, ProbeLookupMixin):
+    ITERATES_IN_ORDER = False  # Whether iter(engine) yields contacts sorted by name
+    
+    def __init__(self, indexed: bool = False, fuzzy: bool = False):
         self.contacts: List[Contact] = []
         self.size = 0
+        self.index: Optional[SecondaryIndex] = SecondaryIndex(fuzzy) if indexed or fuzzy else None
+        self.sorted_view = SortedView()
     
     def insert(self, name: str, phone: str, email: str) -> bool:
         if self.search(name) is not None:
@@ -12,9 +21,24 @@ class ArrayImpl:
         
         new_contact = Contact(name, phone, email)
         self.contacts.append(new_contact)
+        if self.index is not None:
+            self.index.add(new_contact)
+        self.sorted_view.add(new_contact)
         self.size += 1
         return True
     
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        # One pass with a set of known names instead of a search() per contact
+        result = BulkInsertResult()
+        new_contacts = list(dedupe_new_contacts(contacts, {contact.name for contact in self.contacts}, result))
+        self.contacts.extend(new_contacts)
+        for contact in new_contacts:
+            if self.index is not None:
+                self.index.add(contact)
+            self.sorted_view.add(contact)
+        self.size += result.inserted
+        return result
+    
     def search(self, name: str) -> Optional[Contact]:
         search_name = name.strip().lower()
         for contact in self.contacts:
@@ -27,11 +51,7 @@ class ArrayImpl:
         if contact is None:
             return False
         
-        if phone is not None:
-            contact.phone = phone.strip()
-        if email is not None:
-            contact.email = email.strip().lower()
-            
+        self._apply_update(contact, phone, email)
         return True
     
     def delete(self, name: str) -> bool:
@@ -39,13 +59,214 @@ class ArrayImpl:
         for i, contact in enumerate(self.contacts):
             if contact.name == search_name:
                 del self.contacts[i]  # O(n) operation due to shifting elements
+                if self.index is not None:
+                    self.index.remove(contact)
+                self.sorted_view.remove(search_name)
                 self.size -= 1
                 return True
         return False
     
+    def _search_keys(self, keys: Set[str]) -> Dict[str, Contact]:
+        # One scan answers the whole batch; stops early once every key is found
+        found = {}
+        if keys:
+            for contact in self.contacts:
+                if contact.name in keys:
+                    found[contact.name] = contact
+                    if len(found) == len(keys):
+                        break
+        return found
+    
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        keys = [name.strip().lower() for name in names]
+        wanted = set(keys)
+        removed = set()
+        kept = []
+        for contact in self.contacts:
+            if contact.name in wanted:
+                removed.add(contact.name)
+                if self.index is not None:
+                    self.index.remove(contact)
+                self.sorted_view.remove(contact.name)
+            else:
+                kept.append(contact)
+        if removed:
+            # Single compaction instead of one shifting del per name
+            self.contacts[:] = kept
+            self.size -= len(removed)
+        return batch_delete_results(keys, removed)
+    
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        for i, contact in enumerate(self.contacts):
+            if contact.name == search_name:
+                return i + 1, i + 1
+        return len(self.contacts), len(self.contacts)
+    
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the structure, by category (walks every entry)"""
+        report = MemoryReport()
+        report.add('containers', self.contacts)
+        for contact in self.contacts:
+            report.add_contact(contact)
+        if self.index is not None:
+            self.index.add_to_report(report)
+        self.sorted_view.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self.contacts)
+    
     def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
         if sorted_by_name:
-            return sorted(self.contacts, key=lambda x: x.name)
+            return list(self.iter_contacts())  # Copies the cached sorted view
         return self.contacts.copy()
     
-    
\ No newline at end of file
+    
+class SortedArrayImpl(SecondaryIndexMixin, BatchOperationsMixin, PaginationMixin, ProbeLookupMixin):
+    """Array kept ordered by normalized name: O(log n) lookups, O(n) writes, sorted listings for free"""
+    
+    ITERATES_IN_ORDER = True
+    
+    def __init__(self, indexed: bool = False, fuzzy: bool = False):
+        self.contacts: List[Contact] = []
+        self.keys: List[str] = []  # Parallel list of names so bisect compares plain strings
+        self.size = 0
+        self.index: Optional[SecondaryIndex] = SecondaryIndex(fuzzy) if indexed or fuzzy else None
+    
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        search_name = name.strip().lower()
+        i = bisect_left(self.keys, search_name)
+        if i < self.size and self.keys[i] == search_name:
+            return False
+        
+        new_contact = Contact(search_name, phone, email)
+        self.keys.insert(i, search_name)
+        self.contacts.insert(i, new_contact)
+        if self.index is not None:
+            self.index.add(new_contact)
+        self.size += 1
+        return True
+    
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        result = BulkInsertResult()
+        new_contacts = list(dedupe_new_contacts(contacts, set(self.keys), result))
+        if new_contacts:
+            # One merge of the sorted batch into the existing order instead of n shifting inserts
+            by_name = attrgetter('name')
+            new_contacts.sort(key=by_name)
+            self.contacts = list(heapq.merge(self.contacts, new_contacts, key=by_name))
+            self.keys = [contact.name for contact in self.contacts]
+            if self.index is not None:
+                for contact in new_contacts:
+                    self.index.add(contact)
+        
+        self.size += result.inserted
+        return result
+    
+    def _index_of(self, search_name: str) -> int:
+        i = bisect_left(self.keys, search_name)
+        if i < self.size and self.keys[i] == search_name:
+            return i
+        return -1
+    
+    def search(self, name: str) -> Optional[Contact]:
+        i = self._index_of(name.strip().lower())
+        return self.contacts[i] if i >= 0 else None
+    
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        contact = self.search(name)
+        if contact is None:
+            return False
+        
+        self._apply_update(contact, phone, email)
+        return True
+    
+    def delete(self, name: str) -> bool:
+        i = self._index_of(name.strip().lower())
+        if i < 0:
+            return False
+        
+        if self.index is not None:
+            self.index.remove(self.contacts[i])
+        del self.keys[i]
+        del self.contacts[i]
+        self.size -= 1
+        return True
+    
+    def _search_keys(self, keys: Set[str]) -> Dict[str, Contact]:
+        found = {}
+        for key in keys:
+            i = self._index_of(key)
+            if i >= 0:
+                found[key] = self.contacts[i]
+        return found
+    
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        keys = [name.strip().lower() for name in names]
+        positions = {i for i in map(self._index_of, set(keys)) if i >= 0}
+        removed = {self.keys[i] for i in positions}
+        if positions:
+            if self.index is not None:
+                for i in positions:
+                    self.index.remove(self.contacts[i])
+            # Rebuild once rather than shifting the tail for every deleted name
+            self.contacts = [c for i, c in enumerate(self.contacts) if i not in positions]
+            self.keys = [c.name for c in self.contacts]
+            self.size -= len(positions)
+        return batch_delete_results(keys, removed)
+    
+    def iter_from(self, name: str) -> Iterator[Contact]:
+        """Contacts with name >= the given name, in name order"""
+        contacts = self.contacts
+        for i in range(bisect_left(self.keys, name.strip().lower()), len(contacts)):
+            yield contacts[i]
+    
+    def range(self, lo: str, hi: str) -> List[Contact]:
+        """Contacts with lo <= name < hi (names are normalized before comparing)"""
+        start = bisect_left(self.keys, lo.strip().lower())
+        end = bisect_left(self.keys, hi.strip().lower())
+        return self.contacts[start:end]
+    
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[Contact]:
+        """Contacts whose name starts with prefix (at most limit of them, in name order)"""
+        search_prefix = prefix.strip().lower()
+        if not search_prefix:
+            return self.contacts[:limit]
+        # Every name with the prefix sorts before the prefix with its last character bumped
+        upper = search_prefix[:-1] + chr(ord(search_prefix[-1]) + 1)
+        start = bisect_left(self.keys, search_prefix)
+        end = bisect_left(self.keys, upper, start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.contacts[start:end]
+    
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        # Same halving as bisect_left, counted, plus the final equality check
+        lo, hi = 0, len(self.keys)
+        visited = 0
+        while lo < hi:
+            mid = (lo + hi) // 2
+            visited += 1
+            if self.keys[mid] < search_name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return visited, visited + (1 if lo < len(self.keys) else 0)
+    
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the structure, by category (walks every entry)"""
+        report = MemoryReport()
+        report.add('containers', self.contacts)
+        report.add('containers', self.keys)
+        for contact in self.contacts:
+            report.add_contact(contact)
+        if self.index is not None:
+            self.index.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self.contacts)
+    
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        # Already ordered by name, so both modes are a plain copy
+        return self.contacts.copy()
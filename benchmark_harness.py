@@ -0,0 +1,216 @@
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Callable, Sequence, Optional
+
+# Metric paths matching this are better when larger; everything else is a time or a size
+HIGHER_IS_BETTER = re.compile(r'per_s|throughput|hit_rate|speedup|ops/s|writes/s')
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile (q in [0, 100]) of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class TimingStats:
+    """Per-call latency summary in milliseconds, built from batch samples"""
+
+    def __init__(self, samples: List[float], calls_per_sample: int):
+        # Each sample is the mean per-call time of one timed batch
+        self.samples = sorted(samples)
+        self.calls_per_sample = calls_per_sample
+        self.calls = len(samples) * calls_per_sample
+        self.mean = statistics.fmean(samples) if samples else 0.0
+        self.stddev = statistics.stdev(samples) if len(samples) > 1 else 0.0
+        self.p50 = percentile(self.samples, 50)
+        self.p95 = percentile(self.samples, 95)
+        self.p99 = percentile(self.samples, 99)
+
+    @property
+    def min(self) -> float:
+        return self.samples[0] if self.samples else 0.0
+
+    @property
+    def max(self) -> float:
+        return self.samples[-1] if self.samples else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {'mean': self.mean, 'stddev': self.stddev, 'p50': self.p50, 'p95': self.p95,
+                'p99': self.p99, 'min': self.min, 'max': self.max, 'calls': self.calls,
+                'calls_per_sample': self.calls_per_sample}
+
+    def __str__(self) -> str:
+        return (f"TimingStats(mean={self.mean:.6f} ms, p50={self.p50:.6f}, p95={self.p95:.6f}, "
+                f"p99={self.p99:.6f}, stddev={self.stddev:.6f}, calls={self.calls})")
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def time_calls(func: Callable, calls: Sequence[tuple], warmup: int = 10,
+               min_sample_seconds: float = 50e-6, calls_per_sample: Optional[int] = None) -> TimingStats:
+    """
+    Time func(*args) for every args tuple in calls, in order, each call made exactly once.
+
+    The first `warmup` calls are made untimed and also calibrate how many calls go into one
+    timed sample (enough for min_sample_seconds, unless calls_per_sample is given). A
+    percentile is over per-sample means, so it describes batches of calls, not single calls.
+    """
+    warmup = min(warmup, max(len(calls) - 1, 0))
+    start = time.perf_counter()
+    for args in calls[:warmup]:
+        func(*args)
+    elapsed = time.perf_counter() - start
+
+    if calls_per_sample is None:
+        per_call = elapsed / warmup if warmup else 0.0
+        calls_per_sample = max(1, math.ceil(min_sample_seconds / per_call)) if per_call > 0 else 1
+    calls_per_sample = max(1, min(calls_per_sample, len(calls) - warmup)) if len(calls) > warmup else 1
+
+    samples = []
+    perf_counter = time.perf_counter
+    for i in range(warmup, len(calls) - calls_per_sample + 1, calls_per_sample):
+        batch = calls[i:i + calls_per_sample]
+        start = perf_counter()
+        for args in batch:
+            func(*args)
+        samples.append((perf_counter() - start) * 1000 / calls_per_sample)
+    return TimingStats(samples, calls_per_sample)
+
+
+def environment_info() -> Dict[str, Any]:
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def _jsonable(value: Any) -> Any:
+    # Result dicts use int dataset sizes as keys and may hold TimingStats or NumPy scalars
+    if isinstance(value, TimingStats):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if hasattr(value, 'item') and callable(value.item):
+        return value.item()
+    return value
+
+
+def write_results(path: str, results: Dict[str, Any], higher_is_better: Sequence[str] = ()) -> None:
+    """
+    Write benchmark results plus environment details as JSON.
+
+    higher_is_better lists regexes for metric paths (e.g. '^sharded/') that are throughputs
+    even though their names don't say so, for compare_results to pick up.
+    """
+    document = {'environment': environment_info(), 'results': _jsonable(results),
+                'higher_is_better': list(higher_is_better)}
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def flatten_metrics(value: Any, prefix: str = '') -> Dict[str, float]:
+    """Numeric leaves of a nested results dict keyed by their '/'-joined path"""
+    metrics = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            metrics.update(flatten_metrics(item, f"{prefix}/{key}" if prefix else str(key)))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        metrics[prefix] = float(value)
+    return metrics
+
+
+class Regression:
+    """A metric that moved in the wrong direction by more than the allowed threshold"""
+
+    def __init__(self, metric: str, baseline: float, current: float, change: float):
+        self.metric = metric
+        self.baseline = baseline
+        self.current = current
+        self.change = change  # Relative change in the "worse" direction, e.g. 0.25 = 25% worse
+
+    def __str__(self) -> str:
+        return f"{self.metric}: {self.baseline:.6g} -> {self.current:.6g} ({self.change:+.1%} worse)"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10,
+                    include: Optional[str] = None) -> List[Regression]:
+    """
+    Regressions between two loaded result documents, checking metrics present in both.
+
+    include is an optional regex a metric path must match (e.g. 'search' or '^results/Hash Map/').
+    Counters such as 'calls' and zero baselines are skipped.
+    """
+    old = flatten_metrics(baseline.get('results', baseline))
+    new = flatten_metrics(current.get('results', current))
+    pattern = re.compile(include) if include else None
+    higher = [HIGHER_IS_BETTER] + [re.compile(hint) for hint in baseline.get('higher_is_better', [])]
+    regressions = []
+    for metric in sorted(old.keys() & new.keys()):
+        if pattern is not None and not pattern.search(metric):
+            continue
+        if metric.endswith(('/calls', '/calls_per_sample', '/height')):
+            continue
+        before, after = old[metric], new[metric]
+        if before == 0:
+            continue
+        if any(hint.search(metric) for hint in higher):
+            change = (before - after) / before
+        else:
+            change = (after - before) / before
+        if change > threshold:
+            regressions.append(Regression(metric, before, after, change))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark result tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+    compare = commands.add_parser('compare', help="Fail if current.json regressed against baseline.json")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help="Allowed relative slowdown per metric (default 0.10 = 10%%)")
+    compare.add_argument('--include', help="Only check metrics whose path matches this regex")
+    args = parser.parse_args(argv)
+
+    regressions = compare_results(load_results(args.baseline), load_results(args.current),
+                                  args.threshold, args.include)
+    if not regressions:
+        print(f"No regressions above {args.threshold:.0%}")
+        return 0
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}:")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,111 +1,465 @@
-from typing import List, Optional
-from helper import Contact
+import heapq
+from bisect import bisect_left
+from operator import attrgetter
+from typing import List, Optional, Dict, Iterable, Iterator, Set, Tuple
+from helper import (Contact, BulkInsertResult, BatchOperationsMixin, batch_delete_results, MemoryReport,
+                    PaginationMixin, ProbeLookupMixin, probe_binary_tree, dedupe_new_contacts)
+from indexes import SecondaryIndex, SecondaryIndexMixin
 
 class BSTNode:
+    __slots__ = ('contact', 'left', 'right')
+
     def __init__(self, contact: Contact):
         self.contact = contact
         self.left: Optional['BSTNode'] = None
         self.right: Optional['BSTNode'] = None
 
-class BstImpl:
-    def __init__(self):
+class AVLNode(BSTNode):
+    __slots__ = ('height',)
+
+    def __init__(self, contact: Contact):
+        super().__init__(contact)
+        self.height = 1
+
+class RBNode(BSTNode):
+    __slots__ = ('red',)
+
+    def __init__(self, contact: Contact):
+        super().__init__(contact)
+        self.red = True  # New nodes are always linked in red
+
+class BstImpl(SecondaryIndexMixin, BatchOperationsMixin, PaginationMixin, ProbeLookupMixin):
+    # None keeps the original unbalanced tree, 'avl' and 'red_black' guarantee O(log n) height
+    BALANCE_MODES = (None, 'avl', 'red_black')
+    ITERATES_IN_ORDER = True  # Whether iter(engine) yields contacts sorted by name
+
+    def __init__(self, balance: Optional[str] = None, indexed: bool = False, fuzzy: bool = False):
+        if balance not in self.BALANCE_MODES:
+            raise ValueError(f"balance must be one of {self.BALANCE_MODES}, got {balance!r}")
+        self.balance = balance
         self.root: Optional[BSTNode] = None
         self.size = 0
-    
+        self.index: Optional[SecondaryIndex] = SecondaryIndex(fuzzy) if indexed or fuzzy else None
+
     def insert(self, name: str, phone: str, email: str) -> bool:
         if self.search(name) is not None:
             return False
-        
+
         new_contact = Contact(name, phone, email)
-        self.root = self._insert_recursive(self.root, new_contact)
+        if self.balance == 'avl':
+            self.root = self._avl_insert(self.root, new_contact)
+        elif self.balance == 'red_black':
+            self.root = self._rb_insert(self.root, new_contact)
+            self.root.red = False
+        else:
+            self._insert_iterative(new_contact)
+        if self.index is not None:
+            self.index.add(new_contact)
         self.size += 1
         return True
-    
-    def _insert_recursive(self, node: Optional[BSTNode], contact: Contact) -> BSTNode:
-        if node is None:
-            return BSTNode(contact)
-        
-        if contact.name < node.contact.name:
-            node.left = self._insert_recursive(node.left, contact)
-        else:
-            node.right = self._insert_recursive(node.right, contact)
-        
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        result = BulkInsertResult()
+        existing = self.list_all_contacts()
+        new_contacts = list(dedupe_new_contacts(contacts, {contact.name for contact in existing}, result))
+
+        if self.balance == 'red_black':
+            # The left-leaning invariant can't be laid out directly, so insert one by one (O(log n) each)
+            for contact in new_contacts:
+                self.root = self._rb_insert(self.root, contact)
+                self.root.red = False
+        elif new_contacts:
+            # Timsort is O(n) on already sorted input; merging with the existing inorder keeps it O(n + m log m)
+            by_name = attrgetter('name')
+            new_contacts.sort(key=by_name)
+            merged = list(heapq.merge(existing, new_contacts, key=by_name)) if existing else new_contacts
+            self.root = self._build_balanced(merged, 0, len(merged))
+
+        if self.index is not None:
+            for contact in new_contacts:
+                self.index.add(contact)
+        self.size += result.inserted
+        return result
+
+    def _build_balanced(self, contacts: List[Contact], lo: int, hi: int) -> Optional[BSTNode]:
+        # Middle element becomes the root, so the tree is perfectly balanced
+        if lo >= hi:
+            return None
+
+        mid = (lo + hi) // 2
+        node = AVLNode(contacts[mid]) if self.balance == 'avl' else BSTNode(contacts[mid])
+        node.left = self._build_balanced(contacts, lo, mid)
+        node.right = self._build_balanced(contacts, mid + 1, hi)
+        if self.balance == 'avl':
+            self._avl_refresh(node)
         return node
-    
+
+    def _insert_iterative(self, contact: Contact) -> None:
+        # Iterative so that a degenerate (sorted-input) tree can't exhaust the recursion limit
+        new_node = BSTNode(contact)
+        if self.root is None:
+            self.root = new_node
+            return
+
+        node = self.root
+        while True:
+            if contact.name < node.contact.name:
+                if node.left is None:
+                    node.left = new_node
+                    return
+                node = node.left
+            else:
+                if node.right is None:
+                    node.right = new_node
+                    return
+                node = node.right
+
     def search(self, name: str) -> Optional[Contact]:
         search_name = name.strip().lower()
-        return self._search_recursive(self.root, search_name)
-    
-    def _search_recursive(self, node: Optional[BSTNode], name: str) -> Optional[Contact]:
-        if node is None:
-            return None
-        
-        if name == node.contact.name:
-            return node.contact
-        elif name < node.contact.name:
-            return self._search_recursive(node.left, name)
-        else:
-            return self._search_recursive(node.right, name)
-    
+        node = self._find_node(search_name)
+        return node.contact if node is not None else None
+
+    def _find_node(self, name: str) -> Optional[BSTNode]:
+        node = self.root
+        while node is not None:
+            if name == node.contact.name:
+                return node
+            elif name < node.contact.name:
+                node = node.left
+            else:
+                node = node.right
+        return None
+
     def update(self, name: str, phone: str = None, email: str = None) -> bool:
         contact = self.search(name)
         if contact is None:
             return False
-        
-        if phone is not None:
-            contact.phone = phone.strip()
-        if email is not None:
-            contact.email = email.strip().lower()
-            
+
+        self._apply_update(contact, phone, email)
         return True
-    
+
     def delete(self, name: str) -> bool:
-        search_name = name.strip().lower()
-        if self.search(name) is None:
+        contact = self.search(name)
+        if contact is None:
             return False
-        
-        self.root = self._delete_recursive(self.root, search_name)
-        self.size -= 1
+
+        self._delete_contact(contact)
         return True
-    
-    def _delete_recursive(self, node: Optional[BSTNode], name: str) -> Optional[BSTNode]:
+
+    def _delete_contact(self, contact: Contact) -> None:
+        # contact must be in the tree
+        search_name = contact.name
+        if self.index is not None:
+            self.index.remove(contact)
+
+        if self.balance == 'avl':
+            self.root = self._avl_delete(self.root, search_name)
+        elif self.balance == 'red_black':
+            if not self._is_red(self.root.left) and not self._is_red(self.root.right):
+                self.root.red = True
+            self.root = self._rb_delete(self.root, search_name)
+            if self.root is not None:
+                self.root.red = False
+        else:
+            self._delete_iterative(search_name)
+        self.size -= 1
+
+    def _search_keys(self, keys: Set[str]) -> Dict[str, Contact]:
+        # Single merged descent: each node splits the sorted key range between its subtrees,
+        # so shared path prefixes are walked once for the whole batch
+        sorted_keys = sorted(keys)
+        found = {}
+        stack = [(self.root, 0, len(sorted_keys))]
+        while stack:
+            node, lo, hi = stack.pop()
+            if node is None or lo >= hi:
+                continue
+            name = node.contact.name
+            split = bisect_left(sorted_keys, name, lo, hi)
+            after = split
+            if split < hi and sorted_keys[split] == name:
+                found[name] = node.contact
+                after += 1
+            stack.append((node.left, lo, split))
+            stack.append((node.right, after, hi))
+        return found
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        keys = [name.strip().lower() for name in names]
+        found = self._search_keys(set(keys))
+        for contact in found.values():
+            self._delete_contact(contact)
+        return batch_delete_results(keys, set(found))
+
+    def _delete_iterative(self, name: str) -> None:
+        parent = None
+        node = self.root
+        while node is not None and node.contact.name != name:
+            parent = node
+            node = node.left if name < node.contact.name else node.right
+        if node is None:
+            return
+
+        if node.left is not None and node.right is not None:
+            # Node has two children - splice out the inorder successor instead
+            successor_parent = node
+            successor = node.right
+            while successor.left is not None:
+                successor_parent = successor
+                successor = successor.left
+            node.contact = successor.contact
+            parent, node = successor_parent, successor
+
+        child = node.left if node.left is not None else node.right
+        if parent is None:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+
+    def _find_min(self, node: BSTNode) -> BSTNode:
+        while node.left:
+            node = node.left
+        return node
+
+    # AVL balancing
+
+    @staticmethod
+    def _height(node: Optional[AVLNode]) -> int:
+        return node.height if node is not None else 0
+
+    def _avl_refresh(self, node: AVLNode) -> None:
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+
+    def _avl_rotate_right(self, node: AVLNode) -> AVLNode:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._avl_refresh(node)
+        self._avl_refresh(pivot)
+        return pivot
+
+    def _avl_rotate_left(self, node: AVLNode) -> AVLNode:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._avl_refresh(node)
+        self._avl_refresh(pivot)
+        return pivot
+
+    def _avl_rebalance(self, node: AVLNode) -> AVLNode:
+        self._avl_refresh(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._avl_rotate_left(node.left)
+            return self._avl_rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._avl_rotate_right(node.right)
+            return self._avl_rotate_left(node)
+        return node
+
+    def _avl_insert(self, node: Optional[AVLNode], contact: Contact) -> AVLNode:
+        if node is None:
+            return AVLNode(contact)
+
+        if contact.name < node.contact.name:
+            node.left = self._avl_insert(node.left, contact)
+        else:
+            node.right = self._avl_insert(node.right, contact)
+        return self._avl_rebalance(node)
+
+    def _avl_delete(self, node: Optional[AVLNode], name: str) -> Optional[AVLNode]:
         if node is None:
             return None
-        
+
         if name < node.contact.name:
-            node.left = self._delete_recursive(node.left, name)
+            node.left = self._avl_delete(node.left, name)
         elif name > node.contact.name:
-            node.right = self._delete_recursive(node.right, name)
+            node.right = self._avl_delete(node.right, name)
         else:
-            # Node to delete found
             if node.left is None:
                 return node.right
             elif node.right is None:
                 return node.left
-            else:
-                # Node has two children - find inorder successor
-                successor = self._find_min(node.right)
-                node.contact = successor.contact
-                node.right = self._delete_recursive(node.right, successor.contact.name)
-        
+            successor = self._find_min(node.right)
+            node.contact = successor.contact
+            node.right = self._avl_delete(node.right, successor.contact.name)
+        return self._avl_rebalance(node)
+
+    # Red-black balancing (left-leaning variant)
+
+    @staticmethod
+    def _is_red(node: Optional[RBNode]) -> bool:
+        return node is not None and node.red
+
+    def _rb_rotate_left(self, node: RBNode) -> RBNode:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        pivot.red = node.red
+        node.red = True
+        return pivot
+
+    def _rb_rotate_right(self, node: RBNode) -> RBNode:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        pivot.red = node.red
+        node.red = True
+        return pivot
+
+    def _rb_flip_colors(self, node: RBNode) -> None:
+        node.red = not node.red
+        node.left.red = not node.left.red
+        node.right.red = not node.right.red
+
+    def _rb_fix_up(self, node: RBNode) -> RBNode:
+        if self._is_red(node.right) and not self._is_red(node.left):
+            node = self._rb_rotate_left(node)
+        if self._is_red(node.left) and self._is_red(node.left.left):
+            node = self._rb_rotate_right(node)
+        if self._is_red(node.left) and self._is_red(node.right):
+            self._rb_flip_colors(node)
         return node
-    
-    def _find_min(self, node: BSTNode) -> BSTNode:
-        while node.left:
-            node = node.left
+
+    def _rb_move_red_left(self, node: RBNode) -> RBNode:
+        self._rb_flip_colors(node)
+        if self._is_red(node.right.left):
+            node.right = self._rb_rotate_right(node.right)
+            node = self._rb_rotate_left(node)
+            self._rb_flip_colors(node)
         return node
-    
+
+    def _rb_move_red_right(self, node: RBNode) -> RBNode:
+        self._rb_flip_colors(node)
+        if self._is_red(node.left.left):
+            node = self._rb_rotate_right(node)
+            self._rb_flip_colors(node)
+        return node
+
+    def _rb_insert(self, node: Optional[RBNode], contact: Contact) -> RBNode:
+        if node is None:
+            return RBNode(contact)
+
+        if contact.name < node.contact.name:
+            node.left = self._rb_insert(node.left, contact)
+        else:
+            node.right = self._rb_insert(node.right, contact)
+        return self._rb_fix_up(node)
+
+    def _rb_delete_min(self, node: RBNode) -> Optional[RBNode]:
+        if node.left is None:
+            return None
+        if not self._is_red(node.left) and not self._is_red(node.left.left):
+            node = self._rb_move_red_left(node)
+        node.left = self._rb_delete_min(node.left)
+        return self._rb_fix_up(node)
+
+    def _rb_delete(self, node: RBNode, name: str) -> Optional[RBNode]:
+        # Assumes name is present in the tree (delete() checks with search() first)
+        if name < node.contact.name:
+            if not self._is_red(node.left) and not self._is_red(node.left.left):
+                node = self._rb_move_red_left(node)
+            node.left = self._rb_delete(node.left, name)
+        else:
+            if self._is_red(node.left):
+                node = self._rb_rotate_right(node)
+            if name == node.contact.name and node.right is None:
+                return None
+            if not self._is_red(node.right) and not self._is_red(node.right.left):
+                node = self._rb_move_red_right(node)
+            if name == node.contact.name:
+                node.contact = self._find_min(node.right).contact
+                node.right = self._rb_delete_min(node.right)
+            else:
+                node.right = self._rb_delete(node.right, name)
+        return self._rb_fix_up(node)
+
+    def height(self) -> int:
+        """Number of levels in the tree (0 when empty)"""
+        height = 0
+        level = [self.root] if self.root is not None else []
+        while level:
+            height += 1
+            level = [child for node in level for child in (node.left, node.right) if child is not None]
+        return height
+
+    def iter_from(self, name: str) -> Iterator[Contact]:
+        """Contacts with name >= the given name, in name order (inorder scan from the lower bound)"""
+        search_name = name.strip().lower()
+        stack = []
+        node = self.root
+        while node is not None:
+            if node.contact.name >= search_name:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+
+        while stack:
+            node = stack.pop()
+            yield node.contact
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[Contact]:
+        """Contacts whose name starts with prefix, in name order (inorder scan from the lower bound)"""
+        search_prefix = prefix.strip().lower()
+        results = []
+        stack = []
+        node = self.root
+        while node is not None:
+            if node.contact.name >= search_prefix:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+
+        while stack and (limit is None or len(results) < limit):
+            node = stack.pop()
+            if not node.contact.name.startswith(search_prefix):
+                break
+            results.append(node.contact)
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+        return results
+
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        # Mirrors _find_node
+        return probe_binary_tree(self.root, search_name)
+
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the structure, by category (walks every entry)"""
+        report = MemoryReport()
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            report.add('nodes', node)
+            report.add_contact(node.contact)
+            stack.extend(child for child in (node.left, node.right) if child is not None)
+        if self.index is not None:
+            self.index.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        # Explicit stack so an unbalanced tree can't exhaust the recursion limit
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.contact
+            node = node.right
+
     def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
-        contacts = []
-        self._inorder_traversal(self.root, contacts)
-        
-        if not sorted_by_name:
-            # BST naturally returns sorted order, so shuffle if not sorted requested
-            return contacts
-        return contacts
-    
-    def _inorder_traversal(self, node: Optional[BSTNode], contacts: List[Contact]) -> None:
-        if node:
-            self._inorder_traversal(node.left, contacts)
-            contacts.append(node.contact)
-            self._inorder_traversal(node.right, contacts)
\ No newline at end of file
+        # BST inorder traversal is already sorted by name
+        return list(self)
@@ -0,0 +1,241 @@
+from collections import OrderedDict
+from typing import List, Optional, Dict, Iterable, Iterator, Tuple, Any
+from helper import Contact, BulkInsertResult
+
+CACHE_POLICIES = ('lru', 'lfu')
+
+_MISSING = object()  # Distinguishes "not cached" from a cached negative lookup (None)
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used key"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.entries.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        elif len(self.entries) >= self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[key] = value
+
+    def discard(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+class LFUCache:
+    """
+    Bounded mapping that evicts the least frequently used key (oldest first on ties).
+
+    Keys are kept in one insertion-ordered bucket per access count, so get/put/evict are
+    all O(1). A key's count is forgotten once it is evicted or discarded.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: Dict[str, Tuple[Any, int]] = {}  # key -> (value, access count)
+        self.buckets: Dict[int, 'OrderedDict[str, None]'] = {}
+        self.min_count = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _unlink(self, key: str, count: int) -> None:
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = count + 1
+
+    def _link(self, key: str, count: int) -> None:
+        self.buckets.setdefault(count, OrderedDict())[key] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+        value, count = entry
+        self._unlink(key, count)
+        self._link(key, count + 1)
+        self.entries[key] = (value, count + 1)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries[key] = (value, entry[1])
+            self.get(key)
+            return
+        if len(self.entries) >= self.capacity:
+            victim, _ = self.buckets[self.min_count].popitem(last=False)
+            if not self.buckets[self.min_count]:
+                del self.buckets[self.min_count]
+            del self.entries[victim]
+            self.evictions += 1
+        self.entries[key] = (value, 1)
+        self._link(key, 1)
+        self.min_count = 1
+
+    def discard(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self._unlink(key, entry[1])
+            if not self.entries:
+                self.min_count = 0
+            elif self.min_count not in self.buckets:
+                self.min_count = min(self.buckets)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.buckets.clear()
+        self.min_count = 0
+
+
+class CachedStore:
+    """
+    Read-through cache in front of any engine, keyed by normalized name.
+
+    search() answers repeated lookups from a bounded LRU or LFU cache, including names
+    that were not found (cache_negative=True). Every write through the store drops the
+    affected names from the cache; writes made to the engine directly bypass it and can
+    leave stale entries behind.
+    """
+
+    def __init__(self, engine, capacity: int = 1024, policy: str = 'lru', cache_negative: bool = True):
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"policy must be one of {CACHE_POLICIES}, got {policy!r}")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.engine = engine
+        self.cache = LRUCache(capacity) if policy == 'lru' else LFUCache(capacity)
+        self.cache_negative = cache_negative
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def evictions(self) -> int:
+        return self.cache.evictions
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hit_rate, 'cached': len(self.cache)}
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.cache.evictions = 0
+
+    def _fill(self, search_name: str, contact: Optional[Contact]) -> None:
+        if contact is not None or self.cache_negative:
+            self.cache.put(search_name, contact)
+
+    def search(self, name: str) -> Optional[Contact]:
+        search_name = name.strip().lower()
+        contact = self.cache.get(search_name, _MISSING)
+        if contact is not _MISSING:
+            self.hits += 1
+            return contact
+        self.misses += 1
+        contact = self.engine.search(search_name)
+        self._fill(search_name, contact)
+        return contact
+
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        keys = [name.strip().lower() for name in names]
+        results = [self.cache.get(key, _MISSING) for key in keys]
+        missing = [i for i, contact in enumerate(results) if contact is _MISSING]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            fetched = self.engine.search_many([keys[i] for i in missing])
+            for i, contact in zip(missing, fetched):
+                results[i] = contact
+                self._fill(keys[i], contact)
+        return results
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        self.cache.discard(name.strip().lower())  # May hold a negative entry
+        return self.engine.insert(name, phone, email)
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        contacts = list(contacts)
+        for contact in contacts:
+            self.cache.discard(contact[0].strip().lower())
+        return self.engine.bulk_insert(contacts)
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        self.cache.discard(name.strip().lower())
+        return self.engine.update(name, phone=phone, email=email)
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        updates = list(updates)
+        for update in updates:
+            self.cache.discard(update[0].strip().lower())
+        return self.engine.update_many(updates)
+
+    def delete(self, name: str) -> bool:
+        self.cache.discard(name.strip().lower())
+        return self.engine.delete(name)
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        names = list(names)
+        for name in names:
+            self.cache.discard(name.strip().lower())
+        return self.engine.delete_many(names)
+
+    def clear_cache(self) -> None:
+        self.cache.clear()
+
+    def find_by_phone(self, phone: str) -> Optional[Contact]:
+        return self.engine.find_by_phone(phone)
+
+    def find_by_email(self, email: str) -> Optional[Contact]:
+        return self.engine.find_by_email(email)
+
+    def find_by_domain(self, domain: str) -> List[Contact]:
+        return self.engine.find_by_domain(domain)
+
+    def search_fuzzy(self, name: str, max_distance: int = 2, limit: Optional[int] = 10) -> List[Contact]:
+        return self.engine.search_fuzzy(name, max_distance, limit)
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        return self.engine.list_all_contacts(sorted_by_name)
+
+    def iter_contacts(self, sorted: bool = True, start_after: Optional[str] = None,
+                      limit: Optional[int] = None) -> Iterator[Contact]:
+        return self.engine.iter_contacts(sorted, start_after, limit)
+
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self.engine)
+
+    @property
+    def ITERATES_IN_ORDER(self) -> bool:
+        return self.engine.ITERATES_IN_ORDER
+
+    @property
+    def size(self) -> int:
+        return self.engine.size
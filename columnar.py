@@ -0,0 +1,192 @@
+import sys
+from array import array
+from typing import List, Optional, Dict, Iterable, Iterator, Tuple
+from helper import Contact, BulkInsertResult, MemoryReport, PaginationMixin, SortedView, ProbeLookupMixin
+from indexes import SecondaryIndexMixin
+
+class PackedStrings:
+    """Column of strings packed into one UTF-8 buffer, addressed by (offset, length) per row"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('Q')
+        self.lengths = array('I')
+        self.garbage = 0  # Bytes no longer referenced by any row
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def get(self, row: int) -> str:
+        start = self.offsets[row]
+        return self.data[start:start + self.lengths[row]].decode()
+
+    def append(self, value: str) -> None:
+        encoded = value.encode()
+        self.offsets.append(len(self.data))
+        self.lengths.append(len(encoded))
+        self.data += encoded
+
+    def set(self, row: int, value: str) -> None:
+        # Old bytes are left in place and reclaimed by compact()
+        encoded = value.encode()
+        self.garbage += self.lengths[row]
+        self.offsets[row] = len(self.data)
+        self.lengths[row] = len(encoded)
+        self.data += encoded
+        self._maybe_compact()
+
+    def swap_remove(self, row: int) -> None:
+        """Remove row by moving the last row into its place (O(1), changes row order)"""
+        self.garbage += self.lengths[row]
+        last = len(self.offsets) - 1
+        self.offsets[row] = self.offsets[last]
+        self.lengths[row] = self.lengths[last]
+        self.offsets.pop()
+        self.lengths.pop()
+        self._maybe_compact()
+
+    def add_to_report(self, report: MemoryReport) -> None:
+        # The buffer (including garbage not yet compacted) counts as strings, the row arrays as containers
+        report.add('strings', self.data)
+        report.add('containers', self.offsets)
+        report.add('containers', self.lengths)
+
+    def _maybe_compact(self) -> None:
+        if self.garbage > 4096 and self.garbage * 2 > len(self.data):
+            self.compact()
+
+    def compact(self) -> None:
+        data = bytearray()
+        for row in range(len(self.offsets)):
+            start = self.offsets[row]
+            self.offsets[row] = len(data)
+            data += self.data[start:start + self.lengths[row]]
+        self.data = data
+        self.garbage = 0
+
+
+class ColumnarImpl(SecondaryIndexMixin, PaginationMixin, ProbeLookupMixin):
+    """
+    Struct-of-arrays contact store: names, phones and emails live in parallel columns
+    instead of one Contact object per entry.
+
+    Names are interned and shared between the name column and the lookup dict; phones
+    and emails are packed into contiguous byte buffers. search() and list_all_contacts()
+    build Contact objects on demand, so changes must go through update().
+    """
+
+    ITERATES_IN_ORDER = False
+
+    def __init__(self):
+        self.rows: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.phones = PackedStrings()
+        self.emails = PackedStrings()
+        self.sorted_view = SortedView(lookup=self.search_many)  # Names only: contacts are built per page
+        self.size = 0
+
+    def _append(self, search_name: str, phone: str, email: str) -> None:
+        search_name = sys.intern(search_name)
+        self.rows[search_name] = len(self.names)
+        self.names.append(search_name)
+        self.phones.append(phone.strip())
+        self.emails.append(email.strip().lower())
+
+    def _contact_at(self, row: int) -> Contact:
+        return Contact(self.names[row], self.phones.get(row), self.emails.get(row))
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        search_name = name.strip().lower()
+        if search_name in self.rows:
+            return False
+
+        self._append(search_name, phone, email)
+        self.sorted_view.add_name(search_name)
+        self.size += 1
+        return True
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        result = BulkInsertResult()
+        for name, phone, email in contacts:
+            search_name = name.strip().lower()
+            if search_name in self.rows:
+                result.rejected.append(name)
+                continue
+            self._append(search_name, phone, email)
+            self.sorted_view.add_name(search_name)
+            result.inserted += 1
+
+        self.size += result.inserted
+        return result
+
+    def search(self, name: str) -> Optional[Contact]:
+        row = self.rows.get(name.strip().lower())
+        return self._contact_at(row) if row is not None else None
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        row = self.rows.get(name.strip().lower())
+        if row is None:
+            return False
+
+        if phone is not None:
+            self.phones.set(row, phone.strip())
+        if email is not None:
+            self.emails.set(row, email.strip().lower())
+
+        return True
+
+    def delete(self, name: str) -> bool:
+        search_name = name.strip().lower()
+        row = self.rows.pop(search_name, None)
+        if row is None:
+            return False
+        self.sorted_view.remove(search_name)
+
+        # Swap-remove keeps the columns dense; the moved row gets a new position
+        last_name = self.names.pop()
+        if row < len(self.names):
+            self.names[row] = last_name
+            self.rows[last_name] = row
+        self.phones.swap_remove(row)
+        self.emails.swap_remove(row)
+        self.size -= 1
+        return True
+
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        get = self.rows.get
+        results = []
+        for name in names:
+            row = get(name.strip().lower())
+            results.append(self._contact_at(row) if row is not None else None)
+        return results
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        return [self.update(name, phone, email) for name, phone, email in updates]
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        return [self.delete(name) for name in names]
+
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        # dict probing happens in C and isn't observable; count one bucket and one key check if found
+        return 1, 1 if search_name in self.rows else 0
+
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the structure, by category (walks every entry)"""
+        report = MemoryReport()
+        report.add('containers', self.rows)
+        report.add('containers', self.names)
+        for name in self.names:
+            report.add('strings', name)  # Interned: the same object is the rows key
+        self.phones.add_to_report(report)
+        self.emails.add_to_report(report)
+        self.sorted_view.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        for row in range(self.size):
+            yield self._contact_at(row)
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        if sorted_by_name:
+            return list(self.iter_contacts())
+        return [self._contact_at(row) for row in range(self.size)]
@@ -0,0 +1,295 @@
+import heapq
+import threading
+from contextlib import contextmanager
+from operator import attrgetter
+from typing import List, Optional, Iterable, Iterator, Tuple, Callable
+from helper import Contact, BulkInsertResult, merge_pages
+from fuzzy import merge_fuzzy_results
+from hash_map import HashMapImpl
+
+class ReadWriteLock:
+    """
+    Many concurrent readers or one writer. Waiting writers block new readers so a steady
+    stream of reads can't starve writes. Not reentrant.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ConcurrentStore:
+    """
+    Thread-safe wrapper around any engine: reads share a ReadWriteLock, writes hold it
+    exclusively, so readers never observe a half-relinked list or tree.
+
+    Contacts returned by search() are the engine's own objects; a later update() changes
+    them in place.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.lock = ReadWriteLock()
+        # Self-organizing engines relink nodes on every hit, so their searches are writes
+        self.search_writes = getattr(engine, 'reorders_on_read', False)
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        with self.lock.write_locked():
+            return self.engine.insert(name, phone, email)
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        contacts = list(contacts)  # Consume the input before taking the lock
+        with self.lock.write_locked():
+            return self.engine.bulk_insert(contacts)
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        with self.lock.write_locked():
+            return self.engine.update(name, phone=phone, email=email)
+
+    def delete(self, name: str) -> bool:
+        with self.lock.write_locked():
+            return self.engine.delete(name)
+
+    def search(self, name: str) -> Optional[Contact]:
+        with (self.lock.write_locked() if self.search_writes else self.lock.read_locked()):
+            return self.engine.search(name)
+
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        names = list(names)
+        with self.lock.read_locked():
+            return self.engine.search_many(names)
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        updates = list(updates)
+        with self.lock.write_locked():
+            return self.engine.update_many(updates)
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        names = list(names)
+        with self.lock.write_locked():
+            return self.engine.delete_many(names)
+
+    def find_by_phone(self, phone: str) -> Optional[Contact]:
+        with self.lock.read_locked():
+            return self.engine.find_by_phone(phone)
+
+    def find_by_email(self, email: str) -> Optional[Contact]:
+        with self.lock.read_locked():
+            return self.engine.find_by_email(email)
+
+    def find_by_domain(self, domain: str) -> List[Contact]:
+        with self.lock.read_locked():
+            return self.engine.find_by_domain(domain)
+
+    def search_fuzzy(self, name: str, max_distance: int = 2, limit: Optional[int] = 10) -> List[Contact]:
+        with self.lock.read_locked():
+            return self.engine.search_fuzzy(name, max_distance, limit)
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        with self.lock.read_locked():
+            return self.engine.list_all_contacts(sorted_by_name)
+
+    def iter_contacts(self, sorted: bool = True, start_after: Optional[str] = None,
+                      limit: Optional[int] = None) -> Iterator[Contact]:
+        # The page is copied under the lock, for the same reason as __iter__
+        with self.lock.read_locked():
+            return iter(list(self.engine.iter_contacts(sorted, start_after, limit)))
+
+    def __iter__(self) -> Iterator[Contact]:
+        # Iterating the live engine would hold the read lock for the caller's whole loop
+        return iter(self.list_all_contacts())
+
+    @property
+    def size(self) -> int:
+        with self.lock.read_locked():
+            return self.engine.size
+
+
+class StripedStore:
+    """
+    Hash-partitioned store: contacts are spread over `stripes` independent engines, each
+    behind its own ReadWriteLock, so writers to different stripes don't contend.
+    """
+
+    ITERATES_IN_ORDER = False
+
+    def __init__(self, stripes: int = 16, engine_factory: Callable = HashMapImpl):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self.engines = [engine_factory() for _ in range(stripes)]
+        self.locks = [ReadWriteLock() for _ in range(stripes)]
+        self.search_writes = getattr(self.engines[0], 'reorders_on_read', False)  # As in ConcurrentStore
+
+    def _stripe(self, search_name: str) -> int:
+        return hash(search_name) % len(self.engines)
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        i = self._stripe(name.strip().lower())
+        with self.locks[i].write_locked():
+            return self.engines[i].insert(name, phone, email)
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        # Group by stripe so each lock is taken once per call
+        batches = [[] for _ in self.engines]
+        for contact in contacts:
+            batches[self._stripe(contact[0].strip().lower())].append(contact)
+
+        result = BulkInsertResult()
+        for i, batch in enumerate(batches):
+            if not batch:
+                continue
+            with self.locks[i].write_locked():
+                stripe_result = self.engines[i].bulk_insert(batch)
+            result.inserted += stripe_result.inserted
+            result.rejected.extend(stripe_result.rejected)
+        return result
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        i = self._stripe(name.strip().lower())
+        with self.locks[i].write_locked():
+            return self.engines[i].update(name, phone=phone, email=email)
+
+    def delete(self, name: str) -> bool:
+        i = self._stripe(name.strip().lower())
+        with self.locks[i].write_locked():
+            return self.engines[i].delete(name)
+
+    def search(self, name: str) -> Optional[Contact]:
+        i = self._stripe(name.strip().lower())
+        lock = self.locks[i]
+        with (lock.write_locked() if self.search_writes else lock.read_locked()):
+            return self.engines[i].search(name)
+
+    def _group(self, items: List[tuple]) -> Tuple[List[List[tuple]], List[Tuple[int, int]]]:
+        # Split items (name first) per stripe, remembering where each result goes back
+        groups = [[] for _ in self.engines]
+        positions = []
+        for item in items:
+            i = self._stripe(item[0].strip().lower())
+            positions.append((i, len(groups[i])))
+            groups[i].append(item)
+        return groups, positions
+
+    def _run_grouped(self, method: str, items: List[tuple], write: bool, unpack) -> List:
+        groups, positions = self._group(items)
+        results = []
+        for i, group in enumerate(groups):
+            if not group:
+                results.append([])
+                continue
+            lock = self.locks[i]
+            with (lock.write_locked() if write else lock.read_locked()):
+                results.append(getattr(self.engines[i], method)(unpack(group)))
+        return [results[i][j] for i, j in positions]
+
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        return self._run_grouped('search_many', [(name,) for name in names], False,
+                                 lambda group: [item[0] for item in group])
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        return self._run_grouped('update_many', list(updates), True, list)
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        return self._run_grouped('delete_many', [(name,) for name in names], True,
+                                 lambda group: [item[0] for item in group])
+
+    def _first_match(self, method: str, value: str) -> Optional[Contact]:
+        for engine, lock in zip(self.engines, self.locks):
+            with lock.read_locked():
+                contact = getattr(engine, method)(value)
+            if contact is not None:
+                return contact
+        return None
+
+    def find_by_phone(self, phone: str) -> Optional[Contact]:
+        return self._first_match('find_by_phone', phone)
+
+    def find_by_email(self, email: str) -> Optional[Contact]:
+        return self._first_match('find_by_email', email)
+
+    def find_by_domain(self, domain: str) -> List[Contact]:
+        contacts = []
+        for engine, lock in zip(self.engines, self.locks):
+            with lock.read_locked():
+                contacts.extend(engine.find_by_domain(domain))
+        return contacts
+
+    def search_fuzzy(self, name: str, max_distance: int = 2, limit: Optional[int] = 10) -> List[Contact]:
+        parts = []
+        for engine, lock in zip(self.engines, self.locks):
+            with lock.read_locked():
+                parts.append(engine.search_fuzzy(name, max_distance, limit))
+        return merge_fuzzy_results(name, parts, limit)
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        # Each stripe is locked only while it is copied, so the result is per-stripe consistent
+        parts = []
+        for engine, lock in zip(self.engines, self.locks):
+            with lock.read_locked():
+                parts.append(engine.list_all_contacts(sorted_by_name))
+        if sorted_by_name:
+            return list(heapq.merge(*parts, key=attrgetter('name')))
+        return [contact for part in parts for contact in part]
+
+    def iter_contacts(self, sorted: bool = True, start_after: Optional[str] = None,
+                      limit: Optional[int] = None) -> Iterator[Contact]:
+        # Every stripe's page could hold the whole merged page, so take limit from each
+        parts = []
+        for engine, lock in zip(self.engines, self.locks):
+            with lock.read_locked():
+                parts.append(list(engine.iter_contacts(sorted, start_after, limit)))
+        return iter(merge_pages(parts, sorted, limit))
+
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self.list_all_contacts())
+
+    @property
+    def size(self) -> int:
+        total = 0
+        for engine, lock in zip(self.engines, self.locks):
+            with lock.read_locked():
+                total += engine.size
+        return total
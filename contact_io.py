@@ -0,0 +1,144 @@
+import csv
+import json
+from itertools import islice
+from operator import attrgetter
+from typing import List, Optional, Iterator, Tuple, TextIO
+from helper import Contact
+
+FORMATS = ('csv', 'jsonl')
+CSV_HEADER = ['name', 'phone', 'email']
+
+
+class ImportBatchReport:
+    """Outcome of one imported batch: inserted count, duplicate names and malformed rows"""
+
+    def __init__(self, first_line: int):
+        self.first_line = first_line
+        self.inserted = 0
+        self.rejected: List[str] = []  # Duplicate names refused by the engine
+        self.malformed: List[Tuple[int, str]] = []  # (line number, reason)
+
+    def __str__(self) -> str:
+        return (f"ImportBatchReport(first_line={self.first_line}, inserted={self.inserted}, "
+                f"rejected={len(self.rejected)}, malformed={len(self.malformed)})")
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def _parse_csv(fileobj: TextIO) -> Iterator[Tuple[int, Optional[Tuple[str, str, str]], str]]:
+    reader = csv.reader(fileobj)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield reader.line_num, None, f"unparseable CSV: {e}"
+            continue
+        if not row:
+            continue
+        if len(row) != 3:
+            yield reader.line_num, None, f"expected 3 fields, got {len(row)}"
+        elif [field.strip().lower() for field in row] == CSV_HEADER:
+            continue
+        elif not row[0].strip():
+            yield reader.line_num, None, "empty name"
+        else:
+            yield reader.line_num, (row[0], row[1], row[2]), ''
+
+
+def _parse_jsonl(fileobj: TextIO) -> Iterator[Tuple[int, Optional[Tuple[str, str, str]], str]]:
+    for line_number, line in enumerate(fileobj, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "expected a JSON object"
+            continue
+        fields = [record.get(key) for key in CSV_HEADER]
+        if not all(isinstance(field, str) for field in fields):
+            yield line_number, None, "name, phone and email must be strings"
+        elif not fields[0].strip():
+            yield line_number, None, "empty name"
+        else:
+            yield line_number, (fields[0], fields[1], fields[2]), ''
+
+
+def import_stream(engine, fileobj: TextIO, format: str = 'csv',
+                  batch_size: int = 10_000) -> Iterator[ImportBatchReport]:
+    """
+    Load contacts from a CSV or JSONL text stream into engine, batch_size rows at a time.
+
+    Yields one report per batch after it has been passed to engine.bulk_insert, so memory
+    stays bounded by the batch size. Malformed rows are reported and skipped.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, got {format!r}")
+    rows = _parse_csv(fileobj) if format == 'csv' else _parse_jsonl(fileobj)
+
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+        report = ImportBatchReport(chunk[0][0])
+        batch = []
+        for line_number, contact, error in chunk:
+            if contact is None:
+                report.malformed.append((line_number, error))
+            else:
+                batch.append(contact)
+        if batch:
+            result = engine.bulk_insert(batch)
+            report.inserted = result.inserted
+            report.rejected = result.rejected
+        yield report
+
+
+def iter_engine_contacts(engine, sorted_by_name: bool = False, chunk_size: int = 10_000) -> Iterator[Contact]:
+    """Iterate an engine's contacts without copying them into a new list when possible"""
+    if not sorted_by_name or getattr(engine, 'ITERATES_IN_ORDER', False):
+        return iter(engine)
+    if hasattr(engine, 'iter_contacts'):
+        return _iter_sorted_pages(engine, chunk_size)
+    # No cursor to page with: sort references only (one pointer per contact), not copies of the data
+    return iter(sorted(engine, key=attrgetter('name')))
+
+
+def _iter_sorted_pages(engine, chunk_size: int) -> Iterator[Contact]:
+    # Unordered engines page through their sorted view, so packed engines only ever build
+    # chunk_size contacts at a time
+    last = None
+    while True:
+        page = list(engine.iter_contacts(start_after=last, limit=chunk_size))
+        yield from page
+        if len(page) < chunk_size:
+            return
+        last = page[-1].name
+
+
+def export_stream(engine, fileobj: TextIO, sorted_by_name: bool = False, format: str = 'csv',
+                  chunk_size: int = 10_000) -> int:
+    """Write every contact to fileobj as CSV or JSONL in chunks; returns the number of rows written"""
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, got {format!r}")
+
+    contacts = iter_engine_contacts(engine, sorted_by_name, chunk_size)
+    written = 0
+    if format == 'csv':
+        writer = csv.writer(fileobj)
+        writer.writerow(CSV_HEADER)
+    while True:
+        chunk = list(islice(contacts, chunk_size))
+        if not chunk:
+            return written
+        if format == 'csv':
+            writer.writerows((c.name, c.phone, c.email) for c in chunk)
+        else:
+            fileobj.write(''.join(
+                json.dumps({'name': c.name, 'phone': c.phone, 'email': c.email}) + '\n' for c in chunk))
+        written += len(chunk)
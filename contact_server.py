@@ -0,0 +1,514 @@
+import argparse
+import asyncio
+import random
+import struct
+import sys
+import time
+from typing import List, Optional, Dict, Iterable, Tuple, Any, Callable, Set
+from helper import Contact, BulkInsertResult
+from benchmark_harness import percentile
+
+# Frames: payload length, request id, then an op code (requests) or status (responses)
+_FRAME_HEADER = struct.Struct('<IIB')
+_FIELD_LENGTH = struct.Struct('<H')
+_COUNT = struct.Struct('<I')
+_INT = struct.Struct('<q')
+_MISSING_FIELD = 0xFFFF  # Field length marking a None argument
+MAX_FRAME = 16 * 1024 * 1024
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+# Request ops: code -> (engine method, argument shape, is a write)
+# Shapes: 'name' = one field, 'fields' = the fields as positional arguments,
+# 'list' = all fields as one list, 'triples' = fields grouped into (name, phone, email)
+OPS = {
+    ord('S'): ('search', 'name', False),
+    ord('P'): ('find_by_phone', 'name', False),
+    ord('E'): ('find_by_email', 'name', False),
+    ord('O'): ('find_by_domain', 'name', False),
+    ord('s'): ('search_many', 'list', False),
+    ord('L'): ('list_all_contacts', 'fields', False),
+    ord('Z'): ('size', 'fields', False),
+    ord('I'): ('insert', 'fields', True),
+    ord('U'): ('update', 'fields', True),
+    ord('D'): ('delete', 'name', True),
+    ord('u'): ('update_many', 'triples', True),
+    ord('d'): ('delete_many', 'list', True),
+    ord('B'): ('bulk_insert', 'triples', True)
+}
+OP_CODES = {method: code for code, (method, _, _) in OPS.items()}
+
+
+class RemoteError(Exception):
+    """The server raised while running a request"""
+
+
+def encode_fields(fields: Iterable[Optional[str]]) -> bytes:
+    parts = []
+    for field in fields:
+        if field is None:
+            parts.append(_FIELD_LENGTH.pack(_MISSING_FIELD))
+            continue
+        encoded = field.encode()
+        if len(encoded) >= _MISSING_FIELD:
+            raise ValueError("Fields must be shorter than 65535 bytes")
+        parts.append(_FIELD_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    return b''.join(parts)
+
+
+def decode_fields(payload: bytes) -> List[Optional[str]]:
+    fields = []
+    offset = 0
+    while offset < len(payload):
+        (length,) = _FIELD_LENGTH.unpack_from(payload, offset)
+        offset += _FIELD_LENGTH.size
+        if length == _MISSING_FIELD:
+            fields.append(None)
+            continue
+        fields.append(payload[offset:offset + length].decode())
+        offset += length
+    return fields
+
+
+def encode_value(value: Any) -> bytes:
+    """Tagged encoding of an engine result: None, bool, int, str, Contact, list or BulkInsertResult"""
+    if value is None:
+        return b'N'
+    if value is True:
+        return b'T'
+    if value is False:
+        return b'F'
+    if isinstance(value, int):
+        return b'i' + _INT.pack(value)
+    if isinstance(value, str):
+        return b's' + encode_fields((value,))
+    if isinstance(value, Contact):
+        return b'C' + encode_fields((value.name, value.phone, value.email))
+    if isinstance(value, BulkInsertResult):
+        return b'R' + _INT.pack(value.inserted) + encode_value(value.rejected)
+    if isinstance(value, (list, tuple)):
+        return b'L' + _COUNT.pack(len(value)) + b''.join(encode_value(item) for item in value)
+    raise TypeError(f"cannot encode {type(value).__name__}")
+
+
+def decode_value(data: bytes, offset: int = 0) -> Tuple[Any, int]:
+    """Inverse of encode_value: (value, offset just past it)"""
+    tag = data[offset:offset + 1]
+    offset += 1
+    if tag == b'N':
+        return None, offset
+    if tag in (b'T', b'F'):
+        return tag == b'T', offset
+    if tag == b'i':
+        return _INT.unpack_from(data, offset)[0], offset + _INT.size
+    if tag in (b's', b'C'):
+        count = 1 if tag == b's' else 3
+        fields = []
+        for _ in range(count):
+            (length,) = _FIELD_LENGTH.unpack_from(data, offset)
+            offset += _FIELD_LENGTH.size
+            fields.append(data[offset:offset + length].decode())
+            offset += length
+        return (fields[0] if tag == b's' else Contact(*fields)), offset
+    if tag == b'R':
+        (inserted,) = _INT.unpack_from(data, offset)
+        rejected, offset = decode_value(data, offset + _INT.size)
+        return BulkInsertResult(inserted, rejected), offset
+    if tag == b'L':
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        items = []
+        for _ in range(count):
+            item, offset = decode_value(data, offset)
+            items.append(item)
+        return items, offset
+    raise ValueError(f"unknown value tag {tag!r}")
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[int, int, bytes]:
+    length, request_id, code = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+    if length > MAX_FRAME:
+        raise ValueError(f"frame of {length} bytes exceeds MAX_FRAME")
+    return request_id, code, await reader.readexactly(length)
+
+
+def _frame(request_id: int, code: int, payload: bytes) -> bytes:
+    return _FRAME_HEADER.pack(len(payload), request_id, code) + payload
+
+
+class ContactServer:
+    """
+    asyncio TCP / Unix-socket front-end serving one engine to many clients.
+
+    Clients may pipeline: each connection's requests are answered in the order they
+    arrived. Every write goes through one writer task, which applies queued writes in
+    batches, so the engine never sees two writes interleave. Reads run inline on the
+    event loop, after any write the same connection sent earlier has been applied.
+
+    Backpressure: a connection stops reading once max_in_flight of its responses are
+    unsent, readers wait while write_queue_size writes are queued, and responses wait
+    for the socket to drain. A slow client therefore stalls in its own TCP window
+    instead of growing the server's memory.
+    """
+
+    def __init__(self, engine, max_in_flight: int = 256, write_queue_size: int = 1024,
+                 max_write_batch: int = 256):
+        self.engine = engine
+        self.max_in_flight = max_in_flight
+        self.max_write_batch = max_write_batch
+        self.write_queue_size = write_queue_size
+        self.requests = 0
+        self.write_batches = 0
+        self._writes: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, path: Optional[str] = None) -> None:
+        """Listen on a Unix socket at path, or on host:port (port 0 picks a free port)"""
+        self._writes = asyncio.Queue(self.write_queue_size)
+        self._writer_task = asyncio.create_task(self._apply_writes())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+
+    @property
+    def address(self) -> Any:
+        """Bound (host, port) or socket path"""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+
+    async def __aenter__(self) -> 'ContactServer':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _execute(self, code: int, payload: bytes) -> Tuple[int, bytes]:
+        try:
+            if code not in OPS:
+                raise ValueError(f"unknown op {code}")
+            method, shape, _ = OPS[code]
+            fields = decode_fields(payload)
+            if method == 'size':
+                value = self.engine.size
+            elif method == 'list_all_contacts':
+                value = self.engine.list_all_contacts(sorted_by_name=bool(fields and fields[0]))
+            elif shape == 'name':
+                value = getattr(self.engine, method)(fields[0])
+            elif shape == 'fields':
+                value = getattr(self.engine, method)(*fields)
+            elif shape == 'list':
+                value = getattr(self.engine, method)(fields)
+            else:
+                value = getattr(self.engine, method)(list(zip(fields[0::3], fields[1::3], fields[2::3])))
+            return STATUS_OK, encode_value(value)
+        except Exception as e:  # Reported to the client instead of dropping the connection
+            return STATUS_ERROR, encode_value(f"{type(e).__name__}: {e}")
+
+    def _resolve(self, future: asyncio.Future, code: int, payload: bytes) -> None:
+        if not future.done():
+            future.set_result(self._execute(code, payload))
+
+    async def _apply_writes(self) -> None:
+        queue = self._writes
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_write_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            for future, code, payload in batch:
+                self._resolve(future, code, payload)
+            self.write_batches += 1
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        responses: asyncio.Queue = asyncio.Queue(self.max_in_flight)
+        sender = asyncio.create_task(self._send_responses(responses, writer))
+        last_write: Optional[asyncio.Future] = None
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request_id, code, payload = await _read_frame(reader)
+                except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+                    break
+                self.requests += 1
+                future = loop.create_future()
+                if code in OPS and OPS[code][2]:
+                    await self._writes.put((future, code, payload))
+                    last_write = future
+                elif last_write is None or last_write.done():
+                    self._resolve(future, code, payload)
+                else:
+                    # Read-your-writes on a pipelined connection: run once the earlier write is applied
+                    last_write.add_done_callback(
+                        lambda _, future=future, code=code, payload=payload: self._resolve(future, code, payload))
+                await responses.put((request_id, future))
+            await responses.put(None)
+            await sender  # Answer everything already received before closing
+        except asyncio.CancelledError:
+            pass  # close() cancels open connections; end quietly instead of failing the handler task
+        finally:
+            sender.cancel()
+            writer.close()
+            self._connections.discard(task)
+
+    @staticmethod
+    async def _send_responses(responses: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        # Keeps consuming after the client went away so the reading side never blocks on a full queue
+        connected = True
+        while True:
+            item = await responses.get()
+            if item is None:
+                return
+            request_id, future = item
+            status, body = await future
+            if not connected:
+                continue
+            try:
+                writer.write(_frame(request_id, status, body))
+                if responses.empty():  # Coalesce pipelined responses into fewer socket writes
+                    await writer.drain()
+            except ConnectionError:
+                connected = False
+
+
+class ContactConnection:
+    """One client socket; concurrent calls are pipelined and matched to responses by request id"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_in_flight: int = 256):
+        self._reader = reader
+        self._writer = writer
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._lost_reason = "connection closed"
+        self._receiver = asyncio.create_task(self._receive())
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def call(self, method: str, fields: Iterable[Optional[str]] = ()) -> Any:
+        async with self._slots:
+            # Nothing would ever resolve a response future once the receiver has stopped
+            if self._receiver.done():
+                raise ConnectionError(f"connection lost: {self._lost_reason}")
+            request_id = self._next_id
+            self._next_id = (request_id + 1) & 0xFFFFFFFF
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            try:
+                self._writer.write(_frame(request_id, OP_CODES[method], encode_fields(fields)))
+                await self._writer.drain()
+            except ConnectionError:
+                self._pending.pop(request_id, None)
+                raise
+            status, body = await future
+        value = decode_value(body)[0]
+        if status != STATUS_OK:
+            raise RemoteError(value)
+        return value
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                request_id, status, body = await _read_frame(self._reader)
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((status, body))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            self._lost_reason = f"{type(e).__name__}: {e}"
+        finally:
+            # However the receiver stops (server gone, bad frame, close()), no response can arrive now
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"connection lost: {self._lost_reason}"))
+            self._pending.clear()
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._receiver.cancel()
+
+
+class ContactClient:
+    """
+    Pool of connections to a ContactServer with the engine API as coroutines.
+
+    Each call goes to the connection with the fewest requests in flight. An awaited call
+    has been applied before the next one starts; calls issued concurrently (e.g. through
+    asyncio.gather) may run in any order relative to each other.
+    """
+
+    def __init__(self, connections: List[ContactConnection]):
+        self._connections = connections
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: Optional[int] = None, path: Optional[str] = None,
+                      pool_size: int = 4, max_in_flight: int = 256) -> 'ContactClient':
+        connections = []
+        for _ in range(pool_size):
+            if path is not None:
+                reader, writer = await asyncio.open_unix_connection(path)
+            else:
+                reader, writer = await asyncio.open_connection(host, port)
+            connections.append(ContactConnection(reader, writer, max_in_flight))
+        return cls(connections)
+
+    def _call(self, method: str, fields: Iterable[Optional[str]] = ()):
+        connection = min(self._connections, key=lambda c: c.in_flight)
+        return connection.call(method, fields)
+
+    async def insert(self, name: str, phone: str, email: str) -> bool:
+        return await self._call('insert', (name, phone, email))
+
+    async def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        return await self._call('bulk_insert', [field for contact in contacts for field in contact])
+
+    async def search(self, name: str) -> Optional[Contact]:
+        return await self._call('search', (name,))
+
+    async def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        return await self._call('update', (name, phone, email))
+
+    async def delete(self, name: str) -> bool:
+        return await self._call('delete', (name,))
+
+    async def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        return await self._call('search_many', list(names))
+
+    async def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        return await self._call('update_many', [field for update in updates for field in update])
+
+    async def delete_many(self, names: Iterable[str]) -> List[bool]:
+        return await self._call('delete_many', list(names))
+
+    async def find_by_phone(self, phone: str) -> Optional[Contact]:
+        return await self._call('find_by_phone', (phone,))
+
+    async def find_by_email(self, email: str) -> Optional[Contact]:
+        return await self._call('find_by_email', (email,))
+
+    async def find_by_domain(self, domain: str) -> List[Contact]:
+        return await self._call('find_by_domain', (domain,))
+
+    async def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        return await self._call('list_all_contacts', ('1',) if sorted_by_name else ())
+
+    async def size(self) -> int:
+        return await self._call('size')
+
+    async def close(self) -> None:
+        for connection in self._connections:
+            await connection.close()
+
+    async def __aenter__(self) -> 'ContactClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+async def load_test(client: ContactClient, names: List[str], concurrency: int, requests: int,
+                    write_ratio: float = 0.1, batch_size: int = 1, seed: int = 0) -> Dict[str, float]:
+    """
+    Closed-loop load: `concurrency` workers each send their next request as soon as the last
+    one returns. A request is a search (update with probability write_ratio), or a
+    search_many of batch_size names when batch_size > 1. Exactly `requests` requests are
+    sent in total, the remainder spread one each over the first workers. Latencies are
+    in microseconds.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    if requests < 1:
+        raise ValueError(f"requests must be at least 1, got {requests}")
+    if not names:
+        raise ValueError("names must not be empty")
+    per_worker, remainder = divmod(requests, concurrency)
+    latencies: List[float] = []
+    perf_counter = time.perf_counter
+
+    async def worker(worker_id: int) -> None:
+        rnd = random.Random(seed * 1_000_003 + worker_id)
+        for _ in range(per_worker + (worker_id < remainder)):
+            start = perf_counter()
+            if rnd.random() < write_ratio:
+                await client.update(rnd.choice(names), f"{rnd.randint(100, 999)}-{rnd.randint(1000, 9999)}")
+            elif batch_size > 1:
+                await client.search_many([rnd.choice(names) for _ in range(batch_size)])
+            else:
+                await client.search(rnd.choice(names))
+            latencies.append((perf_counter() - start) * 1_000_000)
+
+    started = perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'requests_per_s': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_us': percentile(latencies, 50),
+        'p95_us': percentile(latencies, 95),
+        'p99_us': percentile(latencies, 99),
+        'max_us': latencies[-1] if latencies else 0.0
+    }
+
+
+def serve(engine_factory: Callable, host: str = '127.0.0.1', port: int = 0, path: Optional[str] = None,
+          ready=None) -> None:
+    """Run a server until interrupted; ready (e.g. a multiprocessing.Event) is set once listening"""
+    async def run() -> None:
+        server = ContactServer(engine_factory())
+        await server.start(host, port, path)
+        if ready is not None:
+            ready.set()
+        print(f"Serving {type(server.engine).__name__} on {server.address}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from hash_map import HashMapImpl
+    from bst import BstImpl
+    from skip_list import SkipListImpl
+    from open_addressing import OpenAddressingImpl
+    engines = {'hash_map': HashMapImpl, 'bst': BstImpl, 'skip_list': SkipListImpl,
+               'open_addressing': OpenAddressingImpl}
+
+    parser = argparse.ArgumentParser(description="Serve a contact engine over TCP or a Unix socket")
+    parser.add_argument('--engine', choices=engines, default='hash_map')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7070)
+    parser.add_argument('--unix', metavar='PATH', help="Listen on a Unix socket instead of TCP")
+    args = parser.parse_args(argv)
+    serve(engines[args.engine], args.host, args.port, args.unix)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
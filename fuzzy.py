@@ -0,0 +1,118 @@
+from typing import List, Optional, Dict, Iterable, Set, Tuple
+from helper import Contact, MemoryReport
+
+GRAM = 3
+_PAD = '\x00' * (GRAM - 1)  # Marks the start and end of a name, so edge characters get their own grams
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Edit distance (insertions, deletions, substitutions) between a and b.
+
+    With max_distance, gives up as soon as the distance must exceed it and returns
+    max_distance + 1, which keeps mismatches cheap.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def trigrams(name: str) -> Set[str]:
+    padded = _PAD + name + _PAD
+    return {padded[i:i + GRAM] for i in range(len(padded) - GRAM + 1)}
+
+
+class TrigramIndex:
+    """
+    Inverted index from name trigrams to names, for fuzzy lookups by edit distance.
+
+    One edit changes at most 3 trigrams, so a name within distance k of the query shares
+    at least len(query grams) - 3k of them. Candidates therefore only need to come from
+    the 3k + 1 rarest query grams (any match must contain one of them); they are then
+    counted against the remaining grams and verified with a bounded Levenshtein. Costs
+    about one set entry per trigram of every name.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Set[str]] = {}
+        self.contacts: Dict[str, Contact] = {}
+
+    def __len__(self) -> int:
+        return len(self.contacts)
+
+    def add(self, contact: Contact) -> None:
+        if contact.name in self.contacts:
+            self.contacts[contact.name] = contact  # Same name, no gram changes
+            return
+        self.contacts[contact.name] = contact
+        for gram in trigrams(contact.name):
+            posting = self.postings.get(gram)
+            if posting is None:
+                self.postings[gram] = {contact.name}
+            else:
+                posting.add(contact.name)
+
+    def remove(self, contact: Contact) -> None:
+        if self.contacts.get(contact.name) is not contact:
+            return
+        del self.contacts[contact.name]
+        for gram in trigrams(contact.name):
+            posting = self.postings[gram]
+            posting.discard(contact.name)
+            if not posting:
+                del self.postings[gram]
+
+    def _candidates(self, query: str, max_distance: int) -> Set[str]:
+        grams = trigrams(query)
+        required = len(grams) - GRAM * max_distance
+        if required <= 0:
+            return set(self.contacts)  # Query too short for the gram filter to rule anything out
+
+        empty: Set[str] = set()
+        postings = sorted((self.postings.get(gram, empty) for gram in grams), key=len)
+        probe_count = GRAM * max_distance + 1
+        candidates = set().union(*postings[:probe_count])
+        if required == 1:
+            return candidates
+        return {name for name in candidates
+                if sum(name in posting for posting in postings) >= required}
+
+    def search(self, query: str, max_distance: int = 2, limit: Optional[int] = 10) -> List[Tuple[int, Contact]]:
+        """(distance, contact) pairs within max_distance of query, closest first, then by name"""
+        matches = []
+        for name in self._candidates(query, max_distance):
+            distance = levenshtein(query, name, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, name))
+        matches.sort()
+        if limit is not None:
+            matches = matches[:limit]
+        return [(distance, self.contacts[name]) for distance, name in matches]
+
+    def add_to_report(self, report: MemoryReport) -> None:
+        report.add('index', self.contacts)
+        report.add('index', self.postings)
+        for gram, posting in self.postings.items():
+            report.add('index', gram)
+            report.add('index', posting)
+
+
+def merge_fuzzy_results(name: str, parts: Iterable[List[Contact]], limit: Optional[int] = 10) -> List[Contact]:
+    """Combine search_fuzzy() results from several partitions into one closest-first list"""
+    search_name = name.strip().lower()
+    contacts = [contact for part in parts for contact in part]
+    contacts.sort(key=lambda contact: (levenshtein(search_name, contact.name), contact.name))
+    return contacts[:limit]
@@ -1,10 +1,15 @@
-from typing import List, Optional, Dict
-from helper import Contact
+from typing import List, Optional, Dict, Iterable, Iterator, Set, Tuple
+from helper import Contact, BulkInsertResult, BatchOperationsMixin, MemoryReport, PaginationMixin, SortedView, ProbeLookupMixin
+from indexes import SecondaryIndex, SecondaryIndexMixin
 
-class HashMapImpl:
-    def __init__(self):
+class HashMapImpl(SecondaryIndexMixin, BatchOperationsMixin, PaginationMixin, ProbeLookupMixin):
+    ITERATES_IN_ORDER = False  # Whether iter(engine) yields contacts sorted by name
+    
+    def __init__(self, indexed: bool = False, fuzzy: bool = False):
         self.contacts: Dict[str, Contact] = {}
         self.size = 0
+        self.index: Optional[SecondaryIndex] = SecondaryIndex(fuzzy) if indexed or fuzzy else None
+        self.sorted_view = SortedView()
     
     def insert(self, name: str, phone: str, email: str) -> bool:
         search_name = name.strip().lower()
@@ -13,9 +18,30 @@ class HashMapImpl:
         
         new_contact = Contact(name, phone, email)
         self.contacts[search_name] = new_contact
+        if self.index is not None:
+            self.index.add(new_contact)
+        self.sorted_view.add(new_contact)
         self.size += 1
         return True
     
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        result = BulkInsertResult()
+        store = self.contacts
+        for name, phone, email in contacts:
+            search_name = name.strip().lower()
+            if search_name in store:
+                result.rejected.append(name)
+                continue
+            new_contact = Contact(search_name, phone, email)
+            store[search_name] = new_contact
+            if self.index is not None:
+                self.index.add(new_contact)
+            self.sorted_view.add(new_contact)
+            result.inserted += 1
+        
+        self.size += result.inserted
+        return result
+    
     def search(self, name: str) -> Optional[Contact]:
         search_name = name.strip().lower()
         return self.contacts.get(search_name)
@@ -26,23 +52,68 @@ class HashMapImpl:
         if contact is None:
             return False
         
-        if phone is not None:
-            contact.phone = phone.strip()
-        if email is not None:
-            contact.email = email.strip().lower()
-            
+        self._apply_update(contact, phone, email)
         return True
     
     def delete(self, name: str) -> bool:
         search_name = name.strip().lower()
         if search_name in self.contacts:
-            del self.contacts[search_name]
+            contact = self.contacts.pop(search_name)
+            if self.index is not None:
+                self.index.remove(contact)
+            self.sorted_view.remove(search_name)
             self.size -= 1
             return True
         return False
     
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        get = self.contacts.get
+        return [get(name.strip().lower()) for name in names]
+    
+    def _search_keys(self, keys: Set[str]) -> Dict[str, Contact]:
+        get = self.contacts.get
+        found = {}
+        for key in keys:
+            contact = get(key)
+            if contact is not None:
+                found[key] = contact
+        return found
+    
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        pop = self.contacts.pop
+        results = []
+        for name in names:
+            contact = pop(name.strip().lower(), None)
+            if contact is None:
+                results.append(False)
+                continue
+            if self.index is not None:
+                self.index.remove(contact)
+            self.sorted_view.remove(contact.name)
+            results.append(True)
+        self.size -= results.count(True)
+        return results
+    
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        # dict probing happens in C and isn't observable; count one bucket and one key check if found
+        return 1, 1 if search_name in self.contacts else 0
+    
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the structure, by category (walks every entry)"""
+        report = MemoryReport()
+        report.add('containers', self.contacts)
+        for key, contact in self.contacts.items():
+            report.add_contact(contact)
+            report.add('strings', key)  # Usually a separate copy of contact.name
+        if self.index is not None:
+            self.index.add_to_report(report)
+        self.sorted_view.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self.contacts.values())
+    
     def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
-        contacts = list(self.contacts.values())
         if sorted_by_name:
-            return sorted(contacts, key=lambda x: x.name)
-        return contacts
\ No newline at end of file
+            return list(self.iter_contacts())  # Copies the cached sorted view
+        return list(self.contacts.values())
\ No newline at end of file
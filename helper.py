@@ -1,6 +1,14 @@
-from typing import List, Optional, Dict, Any
+import heapq
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import dropwhile, islice
+from operator import attrgetter
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Set, Tuple, Callable
 
 class Contact:
+    __slots__ = ('name', 'phone', 'email')  # No per-instance __dict__; matters at millions of contacts
+
     def __init__(self, name: str, phone: str, email: str):
         self.name = name.strip().lower() 
         self.phone = phone.strip()
@@ -10,4 +18,289 @@ class Contact:
         return f"Contact(name='{self.name.title()}', phone='{self.phone}', email='{self.email}')"
     
     def __repr__(self) -> str:
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+class BulkInsertResult:
+    """Outcome of a bulk_insert call: how many contacts were added and which names were rejected"""
+
+    def __init__(self, inserted: int = 0, rejected: Optional[List[str]] = None):
+        self.inserted = inserted
+        self.rejected: List[str] = rejected if rejected is not None else []
+
+    def __str__(self) -> str:
+        return f"BulkInsertResult(inserted={self.inserted}, rejected={len(self.rejected)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def dedupe_new_contacts(contacts: Iterable[Tuple[str, str, str]], seen: Set[str],
+                        result: BulkInsertResult) -> Iterator[Contact]:
+    """
+    bulk_insert's duplicate check: yield a Contact for every name not already in seen
+    (normalized names the engine holds), adding it to seen and counting it in result;
+    names already present, or repeated within the batch, go to result.rejected.
+    """
+    for name, phone, email in contacts:
+        search_name = name.strip().lower()
+        if search_name in seen:
+            result.rejected.append(name)
+            continue
+        seen.add(search_name)
+        result.inserted += 1
+        yield Contact(search_name, phone, email)
+
+
+class MemoryReport:
+    """
+    Bytes an engine holds, split into containers (lists, dicts, arrays), nodes, Contact
+    objects, strings, and secondary indexes.
+
+    Built by walking the structure with sys.getsizeof. Each object is counted once, under
+    the first category that reaches it, so a string shared by a Contact and a dict key
+    (or interned) is not counted twice. Allocator overhead isn't included.
+    """
+
+    CATEGORIES = ('containers', 'nodes', 'contacts', 'strings', 'index')
+
+    def __init__(self):
+        self.bytes: Dict[str, int] = dict.fromkeys(self.CATEGORIES, 0)
+        self._seen: Set[int] = set()
+
+    def add(self, category: str, obj: Any) -> None:
+        key = id(obj)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self.bytes[category] += sys.getsizeof(obj)
+
+    def add_contact(self, contact: Contact) -> None:
+        self.add('contacts', contact)
+        self.add('strings', contact.name)
+        self.add('strings', contact.phone)
+        self.add('strings', contact.email)
+
+    @property
+    def total(self) -> int:
+        return sum(self.bytes.values())
+
+    def to_dict(self) -> Dict[str, int]:
+        return {**self.bytes, 'total': self.total}
+
+    def __str__(self) -> str:
+        parts = ", ".join(f"{category}={size:,}" for category, size in self.bytes.items() if size)
+        return f"MemoryReport(total={self.total:,} B: {parts})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class BatchOperationsMixin:
+    """
+    search_many/update_many for engines that provide _search_keys(keys) -> {name: contact}
+    (one pass over the structure for a whole set of normalized names) and
+    _apply_update(contact, phone, email).
+
+    Results line up with the input and match calling search()/update() once per item.
+    """
+
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        keys = [name.strip().lower() for name in names]
+        found = self._search_keys(set(keys))
+        return [found.get(key) for key in keys]
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        """updates: (name, phone, email) tuples; None leaves a field unchanged, as in update()"""
+        updates = [(name.strip().lower(), phone, email) for name, phone, email in updates]
+        found = self._search_keys({key for key, _, _ in updates})
+        results = []
+        for key, phone, email in updates:
+            contact = found.get(key)
+            if contact is None:
+                results.append(False)
+                continue
+            self._apply_update(contact, phone, email)
+            results.append(True)
+        return results
+
+
+class ProbeLookupMixin:
+    """
+    Lookup cost counts for instrumentation, defined once for every engine.
+
+    _probe_lookup(search_name) returns (nodes visited, key comparisons) for a lookup of an
+    already-normalized name. Each engine implements it by replaying its own search path
+    with counters, without side effects: no self-organizing moves, no cache or view
+    updates. Only InstrumentedStore and the probe benchmarks call it.
+    """
+
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        raise NotImplementedError
+
+
+def probe_binary_tree(node, search_name: str) -> Tuple[int, int]:
+    """_probe_lookup walk for nodes with contact/left/right: an equality test per node, plus an ordering test when it fails"""
+    visited = comparisons = 0
+    while node is not None:
+        visited += 1
+        comparisons += 1
+        if search_name == node.contact.name:
+            break
+        comparisons += 1
+        node = node.left if search_name < node.contact.name else node.right
+    return visited, comparisons
+
+
+def batch_delete_results(keys: List[str], removed: Set[str]) -> List[bool]:
+    """Per-name delete_many results: only the first request for a removed name reports True"""
+    results = []
+    for key in keys:
+        results.append(key in removed)
+        removed.discard(key)
+    return results
+
+
+class SortedView:
+    """
+    Name-ordered index of an unordered engine's contacts, for paging and sorted listings.
+
+    Built on the first sorted read, then kept current without re-sorting: the engine only
+    queues its inserts and deletes here (O(1) each), and the next read folds them in, by
+    bisect for a few changes or by one re-sort for many (what survives is already one
+    sorted run, so timsort merges the rest in about linear time).
+
+    By default the view holds the engine's own Contact objects, so in-place updates need
+    no bookkeeping. Engines that build contacts on demand pass lookup (their search_many)
+    instead: the view then keeps names only and resolves each page through it. Folding
+    happens on reads, so the view takes a lock of its own to stay safe under a shared
+    read lock.
+    """
+
+    MAX_BISECT_CHANGES = 64
+
+    def __init__(self, lookup: Optional[Callable[[List[str]], List[Optional[Contact]]]] = None):
+        self.lookup = lookup
+        self.keys: Optional[List[str]] = None  # None until the first sorted read
+        self.contacts: List[Contact] = []  # Parallel to keys, unless lookup is set
+        self.added: Dict[str, Optional[Contact]] = {}
+        self.removed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def add(self, contact: Contact) -> None:
+        if self.keys is not None:
+            self.added[contact.name] = contact
+
+    def add_name(self, search_name: str) -> None:
+        # For views with a lookup, which don't need the contact itself
+        if self.keys is not None:
+            self.added[search_name] = None
+
+    def remove(self, search_name: str) -> None:
+        # A name added since the last read never reached the list, so just forget it
+        if self.keys is not None and search_name not in self.added:
+            self.removed.add(search_name)
+        else:
+            self.added.pop(search_name, None)
+
+    def _refresh(self, source: Iterable[Contact]) -> None:
+        removed = self.removed
+        if self.keys is None:
+            if self.lookup is None:
+                self._rebuild(list(source))
+            else:
+                # Names only: don't hold every contact just to read their names
+                self.keys = sorted(contact.name for contact in source)
+        elif len(self.added) + len(removed) <= self.MAX_BISECT_CHANGES:
+            keys, contacts = self.keys, self.contacts
+            for search_name in removed:
+                i = bisect_left(keys, search_name)
+                if i < len(keys) and keys[i] == search_name:
+                    del keys[i]
+                    if self.lookup is None:
+                        del contacts[i]
+            for search_name, contact in self.added.items():
+                i = bisect_left(keys, search_name)
+                keys.insert(i, search_name)
+                if self.lookup is None:
+                    contacts.insert(i, contact)
+        elif self.lookup is None:
+            contacts = [contact for contact in self.contacts if contact.name not in removed] if removed else self.contacts
+            contacts.extend(self.added.values())
+            self._rebuild(contacts)
+        else:
+            keys = [key for key in self.keys if key not in removed] if removed else self.keys
+            keys.extend(self.added)
+            keys.sort()
+            self.keys = keys
+        self.added.clear()
+        self.removed.clear()
+
+    def _rebuild(self, contacts: List[Contact]) -> None:
+        contacts.sort(key=attrgetter('name'))
+        self.keys = [contact.name for contact in contacts]
+        self.contacts = contacts if self.lookup is None else []
+
+    def page(self, source: Iterable[Contact], start_after: Optional[str], limit: Optional[int]) -> List[Contact]:
+        """Up to limit contacts with names after start_after (normalized), building from source if needed"""
+        with self._lock:
+            if self.keys is None or self.added or self.removed:
+                self._refresh(source)
+            start = bisect_right(self.keys, start_after) if start_after is not None else 0
+            end = start + limit if limit is not None else None
+            if self.lookup is None:
+                return self.contacts[start:end]
+            names = self.keys[start:end]
+        return self.lookup(names)
+
+    def add_to_report(self, report: MemoryReport) -> None:
+        if self.keys is not None:
+            report.add('index', self.keys)
+            report.add('index', self.contacts)
+        report.add('index', self.added)
+        report.add('index', self.removed)
+
+
+class PaginationMixin:
+    """
+    iter_contacts() for an engine: lazy, name-ordered pages behind a start_after cursor.
+
+    Ordered engines (ITERATES_IN_ORDER) must provide iter_from(name). Unordered engines
+    that keep a SortedView in self.sorted_view page through it; any other engine selects
+    each page with a heap, O(n log k) per page but without sorting everything.
+    """
+
+    sorted_view: Optional[SortedView] = None
+
+    def iter_contacts(self, sorted: bool = True, start_after: Optional[str] = None,
+                      limit: Optional[int] = None) -> Iterator[Contact]:
+        """
+        Contacts in name order, starting after the name start_after (pass the last name of
+        the previous page) and stopping after limit of them. sorted=False yields in the
+        engine's own order instead, which only takes a cursor if that order is by name.
+        """
+        after = start_after.strip().lower() if start_after is not None else None
+        if self.ITERATES_IN_ORDER:
+            if after is None:
+                return islice(iter(self), limit)
+            # iter_from() starts at the name itself, the cursor is exclusive
+            return islice(dropwhile(lambda contact: contact.name == after, self.iter_from(after)), limit)
+        if not sorted:
+            if after is not None:
+                raise ValueError("start_after needs sorted=True on an engine that isn't ordered by name")
+            return islice(iter(self), limit)
+
+        if self.sorted_view is not None:
+            return iter(self.sorted_view.page(self, after, limit))
+        candidates = iter(self) if after is None else (contact for contact in self if contact.name > after)
+        if limit is None:
+            contacts = list(candidates)
+            contacts.sort(key=attrgetter('name'))
+            return iter(contacts)
+        return iter(heapq.nsmallest(limit, candidates, key=attrgetter('name')))
+
+
+def merge_pages(parts: Iterable[List[Contact]], sorted: bool, limit: Optional[int]) -> List[Contact]:
+    """Combine iter_contacts() pages from several partitions (each already cut to limit)"""
+    if sorted:
+        return list(islice(heapq.merge(*parts, key=attrgetter('name')), limit))
+    return list(islice((contact for part in parts for contact in part), limit))
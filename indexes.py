@@ -0,0 +1,135 @@
+from typing import List, Optional, Dict
+from helper import Contact, MemoryReport
+from fuzzy import TrigramIndex, levenshtein
+
+class SecondaryIndex:
+    """
+    Reverse lookups by phone, email and email domain, kept in sync by the owning engine.
+    With fuzzy=True it also keeps a trigram index of names for search_fuzzy().
+    """
+
+    def __init__(self, fuzzy: bool = False):
+        # Each key maps to {contact name: contact} so contacts sharing a phone/email stay indexed
+        self.by_phone: Dict[str, Dict[str, Contact]] = {}
+        self.by_email: Dict[str, Dict[str, Contact]] = {}
+        self.by_domain: Dict[str, Dict[str, Contact]] = {}
+        self.names: Optional[TrigramIndex] = TrigramIndex() if fuzzy else None
+
+    @staticmethod
+    def _domain(email: str) -> str:
+        return email.rpartition('@')[2]
+
+    @staticmethod
+    def _add(table: Dict[str, Dict[str, Contact]], key: str, contact: Contact) -> None:
+        bucket = table.get(key)
+        if bucket is None:
+            table[key] = {contact.name: contact}
+        else:
+            bucket[contact.name] = contact
+
+    @staticmethod
+    def _remove(table: Dict[str, Dict[str, Contact]], key: str, contact: Contact) -> None:
+        bucket = table.get(key)
+        if bucket is not None and bucket.get(contact.name) is contact:
+            del bucket[contact.name]
+            if not bucket:
+                del table[key]
+
+    def add(self, contact: Contact) -> None:
+        self._add(self.by_phone, contact.phone, contact)
+        self._add(self.by_email, contact.email, contact)
+        self._add(self.by_domain, self._domain(contact.email), contact)
+        if self.names is not None:
+            self.names.add(contact)
+
+    def remove(self, contact: Contact, keep_name: bool = False) -> None:
+        # Must be called with the contact's current phone/email, i.e. before mutating it;
+        # keep_name leaves the name index alone for updates, which never change the name
+        self._remove(self.by_phone, contact.phone, contact)
+        self._remove(self.by_email, contact.email, contact)
+        self._remove(self.by_domain, self._domain(contact.email), contact)
+        if self.names is not None and not keep_name:
+            self.names.remove(contact)
+
+    def add_to_report(self, report: MemoryReport) -> None:
+        """Count the index tables under 'index' (walk the contacts first: keys reuse their strings)"""
+        for table in (self.by_phone, self.by_email, self.by_domain):
+            report.add('index', table)
+            for key, bucket in table.items():
+                report.add('index', key)
+                report.add('index', bucket)
+        if self.names is not None:
+            self.names.add_to_report(report)
+
+    def find_by_phone(self, phone: str) -> Optional[Contact]:
+        bucket = self.by_phone.get(phone.strip())
+        return next(iter(bucket.values())) if bucket else None
+
+    def find_by_email(self, email: str) -> Optional[Contact]:
+        bucket = self.by_email.get(email.strip().lower())
+        return next(iter(bucket.values())) if bucket else None
+
+    def find_by_domain(self, domain: str) -> List[Contact]:
+        bucket = self.by_domain.get(domain.strip().lower().lstrip('@'))
+        return list(bucket.values()) if bucket else []
+
+
+class SecondaryIndexMixin:
+    """
+    Adds find_by_phone/find_by_email/find_by_domain to an engine.
+
+    Engines constructed with indexed=True answer in O(1) from self.index; otherwise
+    the lookup falls back to an O(n) scan of list_all_contacts(). search_fuzzy() likewise
+    uses the index's trigram index when built with fuzzy=True, and a scan otherwise.
+    """
+
+    index: Optional[SecondaryIndex] = None
+
+    def _apply_update(self, contact: Contact, phone: Optional[str], email: Optional[str]) -> None:
+        # Re-index around the in-place mutation so lookups by the old phone/email stop matching
+        if self.index is not None:
+            self.index.remove(contact, keep_name=True)
+        if phone is not None:
+            contact.phone = phone.strip()
+        if email is not None:
+            contact.email = email.strip().lower()
+        if self.index is not None:
+            self.index.add(contact)
+
+    def find_by_phone(self, phone: str) -> Optional[Contact]:
+        if self.index is not None:
+            return self.index.find_by_phone(phone)
+        search_phone = phone.strip()
+        for contact in self.list_all_contacts():
+            if contact.phone == search_phone:
+                return contact
+        return None
+
+    def find_by_email(self, email: str) -> Optional[Contact]:
+        if self.index is not None:
+            return self.index.find_by_email(email)
+        search_email = email.strip().lower()
+        for contact in self.list_all_contacts():
+            if contact.email == search_email:
+                return contact
+        return None
+
+    def find_by_domain(self, domain: str) -> List[Contact]:
+        if self.index is not None:
+            return self.index.find_by_domain(domain)
+        search_domain = domain.strip().lower().lstrip('@')
+        return [contact for contact in self.list_all_contacts()
+                if contact.email.rpartition('@')[2] == search_domain]
+
+    def search_fuzzy(self, name: str, max_distance: int = 2, limit: Optional[int] = 10) -> List[Contact]:
+        """Contacts whose name is within max_distance edits of name, closest first (ties by name)"""
+        search_name = name.strip().lower()
+        if self.index is not None and self.index.names is not None:
+            return [contact for _, contact in self.index.names.search(search_name, max_distance, limit)]
+        matches = []
+        for contact in self.list_all_contacts():
+            distance = levenshtein(search_name, contact.name, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, contact.name, contact))
+        matches.sort(key=lambda match: match[:2])
+        return [contact for _, _, contact in matches[:limit]]
@@ -0,0 +1,240 @@
+import math
+import time
+from bisect import bisect_left
+from typing import List, Optional, Dict, Iterable, Iterator, Tuple, Any, Sequence
+from helper import Contact, BulkInsertResult, ProbeLookupMixin
+
+# Upper bounds in seconds (Prometheus style); one more implicit +Inf bucket follows
+DEFAULT_LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                           1e-3, 2.5e-3, 5e-3, 1e-2, 0.1, 1.0)
+NODE_BUCKETS = tuple(2 ** i for i in range(21))  # 1 .. ~1M nodes visited
+
+
+class Histogram:
+    """Fixed-bucket histogram: counts per upper bound plus running sum and count"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le label, cumulative count) pairs ending with +Inf, as Prometheus expects"""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            pairs.append(('+Inf' if bound == math.inf else repr(bound), total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (0 when empty, inf past the last bound)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            if total >= target:
+                return bound
+        return math.inf
+
+
+class OperationStats:
+    """Everything recorded for one operation type of one store"""
+
+    def __init__(self, latency_buckets: Sequence[float]):
+        self.latency = Histogram(latency_buckets)
+        self.nodes = Histogram(NODE_BUCKETS)
+        self.comparisons = 0
+        self.max_nodes = 0
+
+    def record_probe(self, visited: int, comparisons: int) -> None:
+        self.nodes.observe(visited)
+        self.comparisons += comparisons
+        if visited > self.max_nodes:
+            self.max_nodes = visited
+
+    def to_dict(self) -> Dict[str, Any]:
+        calls = self.latency.count
+        probes = self.nodes.count
+        return {
+            'calls': calls,
+            'latency_mean_s': self.latency.sum / calls if calls else 0.0,
+            'latency_p50_s': self.latency.quantile(0.5),
+            'latency_p99_s': self.latency.quantile(0.99),
+            'nodes_visited_mean': self.nodes.sum / probes if probes else 0.0,
+            'nodes_visited_max': self.max_nodes,
+            'comparisons_mean': self.comparisons / probes if probes else 0.0
+        }
+
+
+class InstrumentedStore:
+    """
+    Wraps any engine and records, per operation type, a latency histogram plus the nodes
+    visited and key comparisons its lookup makes.
+
+    Instrumentation lives entirely in this wrapper, so an unwrapped engine pays nothing.
+    Probe counts come from the engine's _probe_lookup(), which replays the lookup path
+    with counters before each call (doubling lookup work while enabled; the latency
+    histogram times only the real call). probe=False records latency alone.
+    """
+
+    def __init__(self, engine, label: Optional[str] = None, probe: bool = True,
+                 latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.engine = engine
+        self.label = label or type(engine).__name__
+        self.probe = probe and isinstance(engine, ProbeLookupMixin)
+        self.latency_buckets = latency_buckets
+        self.operations: Dict[str, OperationStats] = {}
+
+    def _stats(self, op: str) -> OperationStats:
+        stats = self.operations.get(op)
+        if stats is None:
+            stats = self.operations[op] = OperationStats(self.latency_buckets)
+        return stats
+
+    def _call(self, op: str, name: Optional[str], method, *args, **kwargs):
+        stats = self._stats(op)
+        if self.probe and name is not None:
+            stats.record_probe(*self.engine._probe_lookup(name.strip().lower()))
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        stats.latency.observe(time.perf_counter() - start)
+        return result
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        return self._call('insert', name, self.engine.insert, name, phone, email)
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        return self._call('bulk_insert', None, self.engine.bulk_insert, contacts)
+
+    def search(self, name: str) -> Optional[Contact]:
+        return self._call('search', name, self.engine.search, name)
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        return self._call('update', name, self.engine.update, name, phone=phone, email=email)
+
+    def delete(self, name: str) -> bool:
+        return self._call('delete', name, self.engine.delete, name)
+
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        return self._call('search_many', None, self.engine.search_many, names)
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        return self._call('update_many', None, self.engine.update_many, updates)
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        return self._call('delete_many', None, self.engine.delete_many, names)
+
+    def find_by_phone(self, phone: str) -> Optional[Contact]:
+        return self._call('find_by_phone', None, self.engine.find_by_phone, phone)
+
+    def find_by_email(self, email: str) -> Optional[Contact]:
+        return self._call('find_by_email', None, self.engine.find_by_email, email)
+
+    def find_by_domain(self, domain: str) -> List[Contact]:
+        return self._call('find_by_domain', None, self.engine.find_by_domain, domain)
+
+    def search_fuzzy(self, name: str, max_distance: int = 2, limit: Optional[int] = 10) -> List[Contact]:
+        return self._call('search_fuzzy', None, self.engine.search_fuzzy, name, max_distance, limit)
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        return self._call('list_all_contacts', None, self.engine.list_all_contacts, sorted_by_name)
+
+    def iter_contacts(self, sorted: bool = True, start_after: Optional[str] = None,
+                      limit: Optional[int] = None) -> Iterator[Contact]:
+        # Pages are lazy, so time fetching the whole page rather than creating the iterator
+        page = self._call('iter_contacts', None, lambda: list(self.engine.iter_contacts(sorted, start_after, limit)))
+        return iter(page)
+
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self.engine)
+
+    @property
+    def ITERATES_IN_ORDER(self) -> bool:
+        return self.engine.ITERATES_IN_ORDER
+
+    @property
+    def size(self) -> int:
+        return self.engine.size
+
+    def tree_shape(self) -> Optional[Dict[str, float]]:
+        """Height against the minimum possible height, for engines with height() (O(n) to compute)"""
+        if not hasattr(self.engine, 'height'):
+            return None
+        height = self.engine.height()
+        optimal = math.ceil(math.log2(self.engine.size + 1))
+        return {'height': height, 'optimal_height': optimal,
+                'height_ratio': height / optimal if optimal else 1.0}
+
+    def reset(self) -> None:
+        self.operations.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'engine': self.label, 'size': self.engine.size, 'tree': self.tree_shape(),
+                'operations': {op: stats.to_dict() for op, stats in self.operations.items()}}
+
+    def to_prometheus(self, prefix: str = 'contacts') -> str:
+        return export_prometheus([self], prefix)
+
+
+def _labels(**labels: str) -> str:
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def export_prometheus(stores: Iterable[InstrumentedStore], prefix: str = 'contacts') -> str:
+    """Render the stores' current metrics in the Prometheus text exposition format"""
+    stores = list(stores)
+    lines = []
+
+    def histogram(metric: str, help_text: str, attribute: str) -> None:
+        lines.append(f"# HELP {prefix}_{metric} {help_text}")
+        lines.append(f"# TYPE {prefix}_{metric} histogram")
+        for store in stores:
+            for op, stats in store.operations.items():
+                hist = getattr(stats, attribute)
+                if not hist.count:
+                    continue
+                for le, count in hist.cumulative():
+                    lines.append(f"{prefix}_{metric}_bucket{_labels(engine=store.label, operation=op, le=le)} {count}")
+                lines.append(f"{prefix}_{metric}_sum{_labels(engine=store.label, operation=op)} {hist.sum!r}")
+                lines.append(f"{prefix}_{metric}_count{_labels(engine=store.label, operation=op)} {hist.count}")
+
+    histogram('operation_duration_seconds', "Engine call latency.", 'latency')
+    histogram('nodes_visited', "Nodes, slots or elements inspected by the lookup of one operation.", 'nodes')
+
+    lines.append(f"# HELP {prefix}_key_comparisons_total Key comparisons made by lookups.")
+    lines.append(f"# TYPE {prefix}_key_comparisons_total counter")
+    for store in stores:
+        for op, stats in store.operations.items():
+            if stats.nodes.count:
+                lines.append(f"{prefix}_key_comparisons_total{_labels(engine=store.label, operation=op)} {stats.comparisons}")
+
+    lines.append(f"# HELP {prefix}_size Contacts currently stored.")
+    lines.append(f"# TYPE {prefix}_size gauge")
+    for store in stores:
+        lines.append(f"{prefix}_size{_labels(engine=store.label)} {store.size}")
+
+    shapes = [(store, store.tree_shape()) for store in stores]
+    shapes = [(store, shape) for store, shape in shapes if shape is not None]
+    if shapes:
+        lines.append(f"# HELP {prefix}_tree_height Height of the engine's tree.")
+        lines.append(f"# TYPE {prefix}_tree_height gauge")
+        for store, shape in shapes:
+            lines.append(f"{prefix}_tree_height{_labels(engine=store.label)} {shape['height']}")
+        lines.append(f"# HELP {prefix}_tree_height_ratio Tree height divided by the minimum possible height.")
+        lines.append(f"# TYPE {prefix}_tree_height_ratio gauge")
+        for store, shape in shapes:
+            lines.append(f"{prefix}_tree_height_ratio{_labels(engine=store.label)} {shape['height_ratio']!r}")
+    return '\n'.join(lines) + '\n'
@@ -1,80 +1,269 @@
-from typing import List, Optional
-from helper import Contact
+from typing import List, Optional, Dict, Iterable, Iterator, Set, Tuple
+from helper import (Contact, BulkInsertResult, BatchOperationsMixin, batch_delete_results, MemoryReport,
+                    PaginationMixin, ProbeLookupMixin, SortedView, dedupe_new_contacts)
+from indexes import SecondaryIndex, SecondaryIndexMixin
 
 class ListNode:
+    __slots__ = ('contact', 'next')
+
     def __init__(self, contact: Contact):
         self.contact = contact
         self.next: Optional['ListNode'] = None
 
-class LinkedListImpl:
-    def __init__(self):
+class CountedListNode(ListNode):
+    __slots__ = ('count',)
+
+    def __init__(self, contact: Contact):
+        super().__init__(contact)
+        self.count = 0  # Successful searches/updates, for reorder='count'
+
+class LinkedListImpl(SecondaryIndexMixin, BatchOperationsMixin, PaginationMixin, ProbeLookupMixin):
+    """
+    Singly linked list with head and tail pointers, optionally self-organizing.
+
+    With reorder set, each search() or update() that finds a contact moves it forward so
+    a skewed access pattern keeps popular contacts near the head: 'move_to_front' jumps it
+    to the head, 'transpose' swaps it with its predecessor (adapts slower, but one burst
+    can't push everything else back), and 'count' keeps the list ordered by access count.
+    Batched calls don't reorder. Reordering makes a search a write, so ConcurrentStore and
+    StripedStore take their write lock for it.
+    """
+
+    REORDER_MODES = (None, 'move_to_front', 'transpose', 'count')
+    ITERATES_IN_ORDER = False  # Whether iter(engine) yields contacts sorted by name
+    
+    def __init__(self, reorder: Optional[str] = None, indexed: bool = False, fuzzy: bool = False):
+        if reorder not in self.REORDER_MODES:
+            raise ValueError(f"reorder must be one of {self.REORDER_MODES}, got {reorder!r}")
+        self.reorder = reorder
+        self.reorders_on_read = reorder is not None
         self.head: Optional[ListNode] = None
+        self.tail: Optional[ListNode] = None
         self.size = 0
+        self.index: Optional[SecondaryIndex] = SecondaryIndex(fuzzy) if indexed or fuzzy else None
+        self.sorted_view = SortedView()
+    
+    def _new_node(self, contact: Contact) -> ListNode:
+        return CountedListNode(contact) if self.reorder == 'count' else ListNode(contact)
+    
+    def _append_node(self, node: ListNode) -> None:
+        if self.tail is None:
+            self.head = node
+        else:
+            self.tail.next = node
+        self.tail = node
+    
+    def _link(self, node: ListNode) -> None:
+        # New contacts go first, except under count ordering where they haven't been accessed yet
+        if self.reorder == 'count':
+            self._append_node(node)
+            return
+        node.next = self.head
+        self.head = node
+        if self.tail is None:
+            self.tail = node
+    
+    def _unlink(self, node: ListNode, previous: Optional[ListNode]) -> None:
+        if previous is None:
+            self.head = node.next
+        else:
+            previous.next = node.next
+        if self.tail is node:
+            self.tail = previous
     
     def insert(self, name: str, phone: str, email: str) -> bool:
-        if self.search(name) is not None:
+        if self._find_node(name.strip().lower()) is not None:  # Scan without reordering
             return False
         
         new_contact = Contact(name, phone, email)
-        new_node = ListNode(new_contact)
-        new_node.next = self.head
-        self.head = new_node
+        self._link(self._new_node(new_contact))
+        if self.index is not None:
+            self.index.add(new_contact)
+        self.sorted_view.add(new_contact)
         self.size += 1
         return True
     
-    def search(self, name: str) -> Optional[Contact]:
-        search_name = name.strip().lower()
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]], assume_unique: bool = False) -> BulkInsertResult:
+        """
+        One pass with a set of known names instead of a search() per contact.
+        assume_unique=True is for trusted loads: it skips the duplicate check entirely and
+        appends at the tail in input order (a duplicate name would then be stored twice).
+        """
+        result = BulkInsertResult()
+        if assume_unique:
+            for name, phone, email in contacts:
+                new_node = self._new_node(Contact(name, phone, email))
+                self._append_node(new_node)
+                if self.index is not None:
+                    self.index.add(new_node.contact)
+                self.sorted_view.add(new_node.contact)
+                result.inserted += 1
+            self.size += result.inserted
+            return result
+        
+        seen = set()
+        current = self.head
+        while current:
+            seen.add(current.contact.name)
+            current = current.next
+        
+        for contact in dedupe_new_contacts(contacts, seen, result):
+            # Same position repeated insert() calls would produce
+            new_node = self._new_node(contact)
+            self._link(new_node)
+            if self.index is not None:
+                self.index.add(contact)
+            self.sorted_view.add(contact)
+        
+        self.size += result.inserted
+        return result
+    
+    def _find_node(self, search_name: str) -> Optional[ListNode]:
         current = self.head
         while current:
             if current.contact.name == search_name:
-                return current.contact
+                return current
             current = current.next
         return None
     
+    def search(self, name: str) -> Optional[Contact]:
+        search_name = name.strip().lower()
+        node = self._access(search_name) if self.reorder is not None else self._find_node(search_name)
+        return node.contact if node is not None else None
+    
     def update(self, name: str, phone: str = None, email: str = None) -> bool:
         search_name = name.strip().lower()
+        node = self._access(search_name) if self.reorder is not None else self._find_node(search_name)
+        if node is None:
+            return False
+        
+        self._apply_update(node.contact, phone, email)
+        return True
+    
+    def _access(self, search_name: str) -> Optional[ListNode]:
+        # Scan remembering two predecessors, then move the node forward per self.reorder
+        before = previous = None
         current = self.head
         while current:
             if current.contact.name == search_name:
-                if phone is not None:
-                    current.contact.phone = phone.strip()
-                if email is not None:
-                    current.contact.email = email.strip().lower()
-                return True
-            current = current.next
-        return False
+                self._promote(current, previous, before)
+                return current
+            before, previous, current = previous, current, current.next
+        return None
+    
+    def _promote(self, node: ListNode, previous: Optional[ListNode], before: Optional[ListNode]) -> None:
+        if self.reorder == 'count':
+            node.count += 1
+            if previous is None or previous.count >= node.count:
+                return
+            # Move ahead of the first node accessed less often; previous is one, so the walk stops by then
+            self._unlink(node, previous)
+            prior = None
+            current = self.head
+            while current.count >= node.count:
+                prior, current = current, current.next
+            node.next = current
+            if prior is None:
+                self.head = node
+            else:
+                prior.next = node
+            return
+        
+        if previous is None:
+            return  # Already first
+        self._unlink(node, previous)
+        if self.reorder == 'move_to_front':
+            node.next = self.head
+            self.head = node
+        else:  # transpose: node takes its predecessor's place
+            node.next = previous
+            if before is None:
+                self.head = node
+            else:
+                before.next = node
     
     def delete(self, name: str) -> bool:
         search_name = name.strip().lower()
-        
-        # Handle empty list
-        if not self.head:
-            return False
-        
-        # Handle deletion of head node
-        if self.head.contact.name == search_name:
-            self.head = self.head.next
-            self.size -= 1
-            return True
-        
-        # Handle deletion of other nodes
+        previous = None
         current = self.head
-        while current.next:
-            if current.next.contact.name == search_name:
-                current.next = current.next.next
+        while current:
+            if current.contact.name == search_name:
+                if self.index is not None:
+                    self.index.remove(current.contact)
+                self.sorted_view.remove(search_name)
+                self._unlink(current, previous)
                 self.size -= 1
                 return True
-            current = current.next
-        
+            previous, current = current, current.next
         return False
     
+    def _search_keys(self, keys: Set[str]) -> Dict[str, Contact]:
+        # One walk answers the whole batch; stops early once every key is found
+        found = {}
+        current = self.head if keys else None
+        while current:
+            if current.contact.name in keys:
+                found[current.contact.name] = current.contact
+                if len(found) == len(keys):
+                    break
+            current = current.next
+        return found
+    
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        keys = [name.strip().lower() for name in names]
+        wanted = set(keys)
+        removed = set()
+        previous = None
+        current = self.head
+        while current and len(removed) < len(wanted):
+            if current.contact.name in wanted:
+                removed.add(current.contact.name)
+                if self.index is not None:
+                    self.index.remove(current.contact)
+                self.sorted_view.remove(current.contact.name)
+                self._unlink(current, previous)
+            else:
+                previous = current
+            current = current.next
+        self.size -= len(removed)
+        return batch_delete_results(keys, removed)
+    
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        visited = 0
+        current = self.head
+        while current:
+            visited += 1
+            if current.contact.name == search_name:
+                break
+            current = current.next
+        return visited, visited
+    
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the structure, by category (walks every entry)"""
+        report = MemoryReport()
+        node = self.head
+        while node is not None:
+            report.add('nodes', node)
+            report.add_contact(node.contact)
+            node = node.next
+        if self.index is not None:
+            self.index.add_to_report(report)
+        self.sorted_view.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        current = self.head
+        while current:
+            yield current.contact
+            current = current.next
+    
     def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        if sorted_by_name:
+            return list(self.iter_contacts())  # Copies the cached sorted view
+        
         contacts = []
         current = self.head
         while current:
             contacts.append(current.contact)
             current = current.next
-        
-        if sorted_by_name:
-            return sorted(contacts, key=lambda x: x.name)
         return contacts
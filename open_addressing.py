@@ -0,0 +1,359 @@
+from array import array
+from typing import List, Optional, Iterable, Iterator, Tuple
+from helper import Contact, BulkInsertResult, MemoryReport, PaginationMixin, SortedView, ProbeLookupMixin
+from indexes import SecondaryIndexMixin
+from columnar import PackedStrings
+
+EMPTY = -1  # Row id of an unused slot
+
+
+class RobinHoodTable:
+    """
+    Open-addressing slot table mapping a key hash to a row id, stored in two flat arrays.
+
+    Robin Hood insertion keeps probe sequences short by letting an entry that is further
+    from its home slot take the place of one that is closer; deletion shifts the following
+    cluster back one slot, so no tombstones are ever left behind. The table only knows
+    hashes and rows: the caller checks whether a candidate row really holds the key.
+    """
+
+    def __init__(self, capacity: int):
+        self.mask = capacity - 1  # Capacity is a power of two
+        self.hashes = array('q', bytes(8 * capacity))
+        self.rows = array('i', [EMPTY]) * capacity
+        self.count = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.mask + 1
+
+    def candidates(self, h: int) -> Iterator[Tuple[int, int]]:
+        """(slot, row) pairs whose hash equals h, in probe order"""
+        mask, hashes, rows = self.mask, self.hashes, self.rows
+        slot = h & mask
+        dist = 0
+        while True:
+            row = rows[slot]
+            if row == EMPTY:
+                return
+            slot_hash = hashes[slot]
+            # An entry closer to home than we are means the key can't be further along
+            if (slot - slot_hash) & mask < dist:
+                return
+            if slot_hash == h:
+                yield slot, row
+            slot = (slot + 1) & mask
+            dist += 1
+
+    def insert(self, h: int, row: int) -> None:
+        """Add an entry (the caller has already checked that the key is absent)"""
+        mask, hashes, rows = self.mask, self.hashes, self.rows
+        slot = h & mask
+        dist = 0
+        while True:
+            current = rows[slot]
+            if current == EMPTY:
+                hashes[slot] = h
+                rows[slot] = row
+                self.count += 1
+                return
+            current_dist = (slot - hashes[slot]) & mask
+            if current_dist < dist:
+                # Take the slot from the richer entry and carry it on instead
+                h, hashes[slot] = hashes[slot], h
+                row, rows[slot] = current, row
+                dist = current_dist
+            slot = (slot + 1) & mask
+            dist += 1
+
+    def remove_slot(self, slot: int) -> None:
+        """Empty slot and shift the rest of its cluster back by one (backward-shift deletion)"""
+        mask, hashes, rows = self.mask, self.hashes, self.rows
+        nxt = (slot + 1) & mask
+        while rows[nxt] != EMPTY and (nxt - hashes[nxt]) & mask != 0:
+            hashes[slot] = hashes[nxt]
+            rows[slot] = rows[nxt]
+            slot = nxt
+            nxt = (nxt + 1) & mask
+        rows[slot] = EMPTY
+        hashes[slot] = 0
+        self.count -= 1
+
+    def find_row(self, h: int, row: int) -> int:
+        """Slot holding exactly this (hash, row) entry, or -1"""
+        for slot, candidate in self.candidates(h):
+            if candidate == row:
+                return slot
+        return -1
+
+
+class OpenAddressingImpl(SecondaryIndexMixin, PaginationMixin, ProbeLookupMixin):
+    """
+    Hash table engine with flat, array-backed storage instead of a dict of Contact objects.
+
+    Contacts live in dense record columns (names, phones and emails packed into byte
+    buffers, plus each row's hash); a RobinHoodTable maps hashes to row ids. When the
+    table fills up it grows incrementally: a table twice the size takes new entries and
+    every write moves a few old slots across, so no single insert pays for a full rehash
+    (incremental_resize=False rehashes everything at once, for comparison).
+    search() and list_all_contacts() build Contact objects on demand, so changes must go
+    through update().
+    """
+
+    ITERATES_IN_ORDER = False
+    MAX_LOAD = 0.85
+    # Old-table slots visited per write while a resize is in progress; anything above ~2.2
+    # drains the old table before the new one reaches MAX_LOAD
+    MIGRATE_STEP = 4
+
+    def __init__(self, initial_capacity: int = 16, incremental_resize: bool = True):
+        capacity = 8
+        while capacity < initial_capacity:
+            capacity *= 2
+        self.table = RobinHoodTable(capacity)
+        self.old_table: Optional[RobinHoodTable] = None  # Being drained into self.table
+        self.migrate_cursor = 0
+        self.incremental_resize = incremental_resize
+        self.names = PackedStrings()
+        self.phones = PackedStrings()
+        self.emails = PackedStrings()
+        self.sorted_view = SortedView(lookup=self.search_many)  # Names only: contacts are built per page
+        self.row_hashes = array('q')
+        self.size = 0
+
+    @staticmethod
+    def _hash(search_name: str) -> int:
+        return hash(search_name)
+
+    def _row_has_name(self, row: int, encoded: bytes) -> bool:
+        names = self.names
+        start = names.offsets[row]
+        length = names.lengths[row]
+        return length == len(encoded) and names.data[start:start + length] == encoded
+
+    def _locate(self, search_name: str, h: int) -> Tuple[Optional[RobinHoodTable], int, int]:
+        """(table, slot, row) of the key, or (None, -1, -1) when absent"""
+        # Same probe as RobinHoodTable.candidates, inlined: this is the hot path of every operation
+        encoded = None
+        for table in (self.table, self.old_table):
+            if table is None:
+                continue
+            mask, hashes, rows = table.mask, table.hashes, table.rows
+            slot = h & mask
+            dist = 0
+            while True:
+                row = rows[slot]
+                if row == EMPTY:
+                    break
+                slot_hash = hashes[slot]
+                if slot_hash == h:
+                    if encoded is None:
+                        encoded = search_name.encode()
+                    if self._row_has_name(row, encoded):
+                        return table, slot, row
+                elif (slot - slot_hash) & mask < dist:
+                    break
+                slot = (slot + 1) & mask
+                dist += 1
+        return None, -1, -1
+
+    def _find_row(self, name: str) -> int:
+        search_name = name.strip().lower()
+        return self._locate(search_name, self._hash(search_name))[2]
+
+    def _contact_at(self, row: int) -> Contact:
+        return Contact(self.names.get(row), self.phones.get(row), self.emails.get(row))
+
+    # Resizing
+
+    def _start_resize(self) -> None:
+        if self.old_table is not None:
+            self._migrate(self.old_table.capacity * 2)  # Finish the previous resize first
+        self.old_table = self.table
+        self.table = RobinHoodTable(self.table.capacity * 2)
+        self.migrate_cursor = 0
+        if not self.incremental_resize:
+            self._migrate(self.old_table.capacity * 2)
+
+    def _migrate(self, steps: int) -> None:
+        old = self.old_table
+        if old is None:
+            return
+        new = self.table
+        cursor = self.migrate_cursor
+        while steps > 0 and old.count:
+            row = old.rows[cursor]
+            if row == EMPTY:
+                cursor += 1
+            else:
+                # Removing shifts the next entry of the cluster into this slot, so stay put
+                new.insert(old.hashes[cursor], row)
+                old.remove_slot(cursor)
+            steps -= 1
+        self.migrate_cursor = cursor
+        if not old.count:
+            self.old_table = None
+
+    def _reserve(self, count: int) -> None:
+        """Grow the table up front so count entries fit without an incremental resize"""
+        if self.old_table is not None:
+            self._migrate(self.old_table.capacity * 2)
+        capacity = self.table.capacity
+        while count > capacity * self.MAX_LOAD:
+            capacity *= 2
+        if capacity == self.table.capacity:
+            return
+        table = RobinHoodTable(capacity)
+        old = self.table
+        for slot in range(old.capacity):
+            if old.rows[slot] != EMPTY:
+                table.insert(old.hashes[slot], old.rows[slot])
+        self.table = table
+
+    # Engine API
+
+    def _append(self, search_name: str, h: int, phone: str, email: str) -> None:
+        row = len(self.row_hashes)
+        self.names.append(search_name)
+        self.phones.append(phone.strip())
+        self.emails.append(email.strip().lower())
+        self.row_hashes.append(h)
+        if self.table.count + 1 > self.table.capacity * self.MAX_LOAD:
+            self._start_resize()
+        self.table.insert(h, row)
+        self._migrate(self.MIGRATE_STEP)
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        search_name = name.strip().lower()
+        h = self._hash(search_name)
+        if self._locate(search_name, h)[0] is not None:
+            return False
+
+        self._append(search_name, h, phone, email)
+        self.sorted_view.add_name(search_name)
+        self.size += 1
+        return True
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        contacts = list(contacts)
+        self._reserve(self.size + len(contacts))  # One rehash up front instead of several on the way
+        result = BulkInsertResult()
+        for name, phone, email in contacts:
+            search_name = name.strip().lower()
+            h = self._hash(search_name)
+            if self._locate(search_name, h)[0] is not None:
+                result.rejected.append(name)
+                continue
+            self._append(search_name, h, phone, email)
+            self.sorted_view.add_name(search_name)
+            self.size += 1
+            result.inserted += 1
+        return result
+
+    def search(self, name: str) -> Optional[Contact]:
+        row = self._find_row(name)
+        return self._contact_at(row) if row != EMPTY else None
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        row = self._find_row(name)
+        if row == EMPTY:
+            return False
+
+        if phone is not None:
+            self.phones.set(row, phone.strip())
+        if email is not None:
+            self.emails.set(row, email.strip().lower())
+        return True
+
+    def delete(self, name: str) -> bool:
+        search_name = name.strip().lower()
+        table, slot, row = self._locate(search_name, self._hash(search_name))
+        if table is None:
+            return False
+
+        table.remove_slot(slot)
+        self.sorted_view.remove(search_name)
+        # Keep the record columns dense: move the last row into the freed one
+        last = len(self.row_hashes) - 1
+        if row != last:
+            last_hash = self.row_hashes[last]
+            for candidate_table in (self.table, self.old_table):
+                last_slot = candidate_table.find_row(last_hash, last) if candidate_table is not None else -1
+                if last_slot != -1:
+                    candidate_table.rows[last_slot] = row
+                    break
+            self.row_hashes[row] = last_hash
+        self.row_hashes.pop()
+        self.names.swap_remove(row)
+        self.phones.swap_remove(row)
+        self.emails.swap_remove(row)
+        self.size -= 1
+        self._migrate(self.MIGRATE_STEP)
+        return True
+
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        results = []
+        for name in names:
+            row = self._find_row(name)
+            results.append(self._contact_at(row) if row != EMPTY else None)
+        return results
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        return [self.update(name, phone, email) for name, phone, email in updates]
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        return [self.delete(name) for name in names]
+
+    @property
+    def capacity(self) -> int:
+        return self.table.capacity
+
+    @property
+    def resizing(self) -> bool:
+        return self.old_table is not None
+
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        # Slots inspected by _locate, and full name comparisons (only made on a hash match)
+        h = self._hash(search_name)
+        encoded = search_name.encode()
+        visited = comparisons = 0
+        for table in (self.table, self.old_table):
+            if table is None:
+                continue
+            mask, hashes, rows = table.mask, table.hashes, table.rows
+            slot = h & mask
+            dist = 0
+            while rows[slot] != EMPTY:
+                visited += 1
+                slot_hash = hashes[slot]
+                if slot_hash == h:
+                    comparisons += 1
+                    if self._row_has_name(rows[slot], encoded):
+                        return visited, comparisons
+                elif (slot - slot_hash) & mask < dist:
+                    break
+                slot = (slot + 1) & mask
+                dist += 1
+        return visited, comparisons
+
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the structure, by category (walks every entry)"""
+        report = MemoryReport()
+        for table in (self.table, self.old_table):
+            if table is not None:
+                report.add('containers', table.hashes)
+                report.add('containers', table.rows)
+        report.add('containers', self.row_hashes)
+        for column in (self.names, self.phones, self.emails):
+            column.add_to_report(report)
+        self.sorted_view.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        for row in range(self.size):
+            yield self._contact_at(row)
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        if sorted_by_name:
+            return list(self.iter_contacts())
+        return [self._contact_at(row) for row in range(self.size)]
@@ -0,0 +1,493 @@
+import heapq
+import mmap
+import os
+import struct
+import zlib
+from collections import Counter
+from itertools import chain, islice
+from operator import attrgetter
+from typing import List, Optional, Iterable, Iterator, Tuple
+from helper import Contact, BulkInsertResult
+
+# Log records: crc32(payload), len(payload), payload = op byte + length-prefixed UTF-8 fields
+_RECORD_HEADER = struct.Struct('<II')
+_FIELD_LENGTH = struct.Struct('<H')
+_MISSING_FIELD = 0xFFFF  # Field length marking an update argument that was None
+
+OP_INSERT = b'I'
+OP_UPDATE = b'U'
+OP_DELETE = b'D'
+
+# Snapshot: magic, next log generation, record count, then a table of record offsets,
+# then the records sorted by name (three length-prefixed fields each)
+SNAPSHOT_MAGIC = b'CSNAP001'
+_SNAPSHOT_HEADER = struct.Struct('<8sQQ')
+_OFFSET = struct.Struct('<Q')
+
+FSYNC_POLICIES = ('always', 'batch', 'none')
+
+
+def _encode_fields(fields: Iterable[Optional[str]]) -> bytes:
+    parts = []
+    for field in fields:
+        if field is None:
+            parts.append(_FIELD_LENGTH.pack(_MISSING_FIELD))
+            continue
+        encoded = field.encode()
+        if len(encoded) >= _MISSING_FIELD:
+            raise ValueError("Contact fields must be shorter than 65535 bytes")
+        parts.append(_FIELD_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    return b''.join(parts)
+
+
+def _decode_fields(buffer, offset: int, count: int) -> Tuple[List[Optional[str]], int]:
+    fields = []
+    for _ in range(count):
+        (length,) = _FIELD_LENGTH.unpack_from(buffer, offset)
+        offset += _FIELD_LENGTH.size
+        if length == _MISSING_FIELD:
+            fields.append(None)
+            continue
+        fields.append(bytes(buffer[offset:offset + length]).decode())
+        offset += length
+    return fields, offset
+
+
+def encode_log_record(op: bytes, *fields: Optional[str]) -> bytes:
+    payload = op + _encode_fields(fields)
+    return _RECORD_HEADER.pack(zlib.crc32(payload), len(payload)) + payload
+
+
+def _insert_record(name: str, phone: str, email: str) -> bytes:
+    return encode_log_record(OP_INSERT, name.strip().lower(), phone.strip(), email.strip().lower())
+
+
+def _update_record(name: str, phone: Optional[str], email: Optional[str]) -> bytes:
+    return encode_log_record(OP_UPDATE, name.strip().lower(),
+                             phone.strip() if phone is not None else None,
+                             email.strip().lower() if email is not None else None)
+
+
+def _delete_record(name: str) -> bytes:
+    return encode_log_record(OP_DELETE, name.strip().lower())
+
+
+def read_log_records(path: str) -> Tuple[List[Tuple[bytes, List[Optional[str]]]], int]:
+    """
+    Decode every intact record of a log file.
+
+    Returns the records and the byte length of the valid prefix; anything after it is a
+    torn or corrupt tail from a crash and should be truncated.
+    """
+    records = []
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    offset = 0
+    while offset + _RECORD_HEADER.size <= len(data):
+        crc, length = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        op = payload[:1]
+        field_count = 1 if op == OP_DELETE else 3
+        fields, _ = _decode_fields(payload, 1, field_count)
+        records.append((op, fields))
+        offset = start + length
+    return records, offset
+
+
+def write_snapshot(path: str, contacts: List[Contact], next_log: int) -> None:
+    """Write contacts (already sorted by name) to path atomically via a temp file and rename"""
+    tmp_path = path + '.tmp'
+    encoded = [_encode_fields((c.name, c.phone, c.email)) for c in contacts]
+    with open(tmp_path, 'wb') as f:
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, next_log, len(encoded)))
+        offset = _SNAPSHOT_HEADER.size + _OFFSET.size * len(encoded)
+        offsets = bytearray()
+        for record in encoded:
+            offsets += _OFFSET.pack(offset)
+            offset += len(record)
+        f.write(offsets)
+        for record in encoded:
+            f.write(record)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(os.path.dirname(path) or '.')
+
+
+def _fsync_directory(directory: str) -> None:
+    # Makes a rename durable; not supported on every platform
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SnapshotReader:
+    """Memory-mapped snapshot: records are decoded on demand, and get() binary-searches without loading"""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.next_log, self.count = _SNAPSHOT_HEADER.unpack_from(self._map, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a contact snapshot")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, i: int) -> Tuple[str, str, str]:
+        (offset,) = _OFFSET.unpack_from(self._map, _SNAPSHOT_HEADER.size + i * _OFFSET.size)
+        fields, _ = _decode_fields(self._map, offset, 3)
+        return fields[0], fields[1], fields[2]
+
+    def __iter__(self) -> Iterator[Tuple[str, str, str]]:
+        return self.iter_from(0)
+
+    def iter_from(self, i: int) -> Iterator[Tuple[str, str, str]]:
+        """Records from index i on, in name order"""
+        if i >= self.count:
+            return
+        (offset,) = _OFFSET.unpack_from(self._map, _SNAPSHOT_HEADER.size + i * _OFFSET.size)
+        for _ in range(i, self.count):
+            fields, offset = _decode_fields(self._map, offset, 3)
+            yield fields[0], fields[1], fields[2]
+
+    def bisect(self, search_name: str) -> int:
+        """Index of the first record whose name is >= search_name (already normalized)"""
+        # UTF-8 bytes sort like the strings they encode, so names compare without decoding
+        key = search_name.encode()
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (offset,) = _OFFSET.unpack_from(self._map, _SNAPSHOT_HEADER.size + mid * _OFFSET.size)
+            (length,) = _FIELD_LENGTH.unpack_from(self._map, offset)
+            start = offset + _FIELD_LENGTH.size
+            if self._map[start:start + length] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, name: str) -> Optional[Tuple[str, str, str]]:
+        search_name = name.strip().lower()
+        i = self.bisect(search_name)
+        if i < self.count:
+            record = self.record(i)
+            if record[0] == search_name:
+                return record
+        return None
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+class PersistentStore:
+    """
+    Durable wrapper around any engine: writes go to an append-only log, and compact()
+    folds the log into a sorted binary snapshot.
+
+    Files in `directory`:
+      contacts.snap      snapshot, records ops up to the start of log generation N
+      contacts.<N>.log   operations applied after that snapshot
+
+    fsync policy: 'always' syncs every write, 'batch' every `batch_size` writes (and on
+    flush/close), 'none' leaves it to the OS.
+
+    On open the snapshot is memory-mapped. With lazy=True it stays mapped and answers
+    reads by binary search, building a Contact only when one is read; a snapshot contact
+    moves into the engine the first time a write touches it. Startup then costs no more
+    than replaying the log tail, and unread contacts stay on disk. lazy=False streams the
+    whole snapshot into the engine with bulk_insert instead, for callers that use the
+    engine directly (find_by_*, engine-specific methods). Either way the log tail is
+    replayed after the snapshot, and a torn final record is truncated.
+    """
+
+    SNAPSHOT_NAME = 'contacts.snap'
+
+    def __init__(self, engine, directory: str, fsync: str = 'batch', batch_size: int = 1000,
+                 compact_every: Optional[int] = 1_000_000, lazy: bool = True):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.engine = engine
+        self.directory = directory
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self.lazy = lazy
+        self.generation = 0
+        self.log_records = 0  # Records in the current log file
+        self._unsynced = 0
+        self._log = None
+        self._snapshot: Optional[SnapshotReader] = None  # Mapped snapshot, when lazy
+        self._shadowed = set()  # Snapshot names the engine owns now (written to, or deleted)
+        self._snapshot_live = 0  # Snapshot records not shadowed
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, self.SNAPSHOT_NAME)
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f'contacts.{generation}.log')
+
+    def _recover(self) -> None:
+        if os.path.exists(self.snapshot_path):
+            reader = SnapshotReader(self.snapshot_path)
+            self.generation = reader.next_log
+            if self.lazy:
+                self._snapshot = reader
+                self._snapshot_live = len(reader)
+            else:
+                try:
+                    self.engine.bulk_insert(reader)
+                finally:
+                    reader.close()
+
+        log_path = self._log_path(self.generation)
+        if os.path.exists(log_path):
+            records, valid_length = read_log_records(log_path)
+            for op, fields in records:
+                self._apply(op, fields)
+            self.log_records = len(records)
+            if valid_length < os.path.getsize(log_path):
+                with open(log_path, 'r+b') as f:
+                    f.truncate(valid_length)
+                    os.fsync(f.fileno())
+
+        # Logs older than the snapshot were already folded into it
+        for entry in os.listdir(self.directory):
+            parts = entry.split('.')
+            if len(parts) == 3 and parts[0] == 'contacts' and parts[2] == 'log' and parts[1].isdigit():
+                if int(parts[1]) < self.generation:
+                    os.remove(os.path.join(self.directory, entry))
+
+        self._log = open(log_path, 'ab')
+
+    def _apply(self, op: bytes, fields: List[Optional[str]]) -> None:
+        if op == OP_INSERT:
+            self.engine.insert(*fields)
+        elif op == OP_UPDATE:
+            self._fault_in(fields[0])
+            self.engine.update(fields[0], phone=fields[1], email=fields[2])
+        elif op == OP_DELETE:
+            self._fault_in(fields[0])
+            self.engine.delete(fields[0])
+
+    def _from_snapshot(self, search_name: str) -> Optional[Tuple[str, str, str]]:
+        # The snapshot record for a name, unless the engine has taken the name over
+        if self._snapshot is None or search_name in self._shadowed:
+            return None
+        return self._snapshot.get(search_name)
+
+    def _fault_in(self, search_name: str) -> None:
+        # Copy a snapshot contact into the engine before a write changes or deletes it
+        record = self._from_snapshot(search_name)
+        if record is not None:
+            self.engine.insert(*record)
+            self._shadowed.add(search_name)
+            self._snapshot_live -= 1
+
+    def _snapshot_contacts(self, after: Optional[str] = None) -> Iterator[Contact]:
+        # Unshadowed snapshot contacts in name order, strictly after the normalized name `after`
+        if self._snapshot is None:
+            return iter(())
+        start = 0 if after is None else self._snapshot.bisect(after)
+        return (Contact(*record) for record in self._snapshot.iter_from(start)
+                if record[0] not in self._shadowed and record[0] != after)
+
+    def _append(self, records: List[bytes]) -> None:
+        # A batch goes in whole before the threshold checks: compacting partway through would
+        # fold the whole batch into the snapshot and still log its remaining records after it
+        if not records:
+            return
+        self._log.write(b''.join(records))
+        self.log_records += len(records)
+        self._unsynced += len(records)
+        if self.fsync == 'always' or (self.fsync == 'batch' and self._unsynced >= self.batch_size):
+            self.flush()
+        if self.compact_every is not None and self.log_records >= self.compact_every:
+            self.compact()
+
+    def flush(self) -> None:
+        """Push buffered log records to the OS and, unless fsync='none', to disk"""
+        self._log.flush()
+        if self.fsync != 'none':
+            os.fsync(self._log.fileno())
+        self._unsynced = 0
+
+    def compact(self) -> None:
+        """Write the engine state as a new snapshot and start an empty log"""
+        self.flush()
+        next_generation = self.generation + 1
+        contacts = self.list_all_contacts(sorted_by_name=True)
+        if self._snapshot is not None:
+            self._snapshot.close()  # Its contacts are copied out, and the file is about to be replaced
+            self._snapshot = None
+        write_snapshot(self.snapshot_path, contacts, next_generation)
+        if self.lazy:
+            # Whatever the engine holds stays there and keeps precedence over the new snapshot
+            self._snapshot = SnapshotReader(self.snapshot_path)
+            self._shadowed = {contact.name for contact in self.engine}
+            self._snapshot_live = len(self._snapshot) - len(self._shadowed)
+
+        old_log_path = self._log_path(self.generation)
+        self._log.close()
+        self.generation = next_generation
+        self._log = open(self._log_path(self.generation), 'ab')
+        self.log_records = 0
+        os.remove(old_log_path)
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._log.close()
+            self._log = None
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def __enter__(self) -> 'PersistentStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Records are encoded before the engine changes, so a field the log can't hold is
+    # rejected without leaving memory ahead of the log
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        record = _insert_record(name, phone, email)
+        if self._from_snapshot(name.strip().lower()) is not None or not self.engine.insert(name, phone, email):
+            return False
+        self._append([record])
+        return True
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        contacts = list(contacts)
+        entries = [(contact, _insert_record(*contact)) for contact in contacts]
+        in_snapshot = []
+        if self._snapshot is not None:
+            fresh = []
+            for entry in entries:
+                if self._from_snapshot(entry[0][0].strip().lower()) is None:
+                    fresh.append(entry)
+                else:
+                    in_snapshot.append(entry[0][0])
+            entries = fresh
+
+        result = self.engine.bulk_insert([contact for contact, _ in entries])
+        # Rejections are always the later occurrences of a name, so match them walking backwards
+        pending_rejections = Counter(result.rejected)
+        accepted = []
+        for (name, _, _), record in reversed(entries):
+            if pending_rejections[name] > 0:
+                pending_rejections[name] -= 1
+                continue
+            accepted.append(record)
+        accepted.reverse()
+        self._append(accepted)
+        result.rejected.extend(in_snapshot)
+        return result
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        record = _update_record(name, phone, email)
+        self._fault_in(name.strip().lower())
+        if not self.engine.update(name, phone=phone, email=email):
+            return False
+        self._append([record])
+        return True
+
+    def delete(self, name: str) -> bool:
+        record = _delete_record(name)
+        self._fault_in(name.strip().lower())
+        if not self.engine.delete(name):
+            return False
+        self._append([record])
+        return True
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        updates = list(updates)
+        records = [_update_record(name, phone, email) for name, phone, email in updates]
+        for name, _, _ in updates:
+            self._fault_in(name.strip().lower())
+        results = self.engine.update_many(updates)
+        self._append([record for record, updated in zip(records, results) if updated])
+        return results
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        names = list(names)
+        records = [_delete_record(name) for name in names]
+        for name in names:
+            self._fault_in(name.strip().lower())
+        results = self.engine.delete_many(names)
+        self._append([record for record, deleted in zip(records, results) if deleted])
+        return results
+
+    def search(self, name: str) -> Optional[Contact]:
+        contact = self.engine.search(name)
+        if contact is None:
+            record = self._from_snapshot(name.strip().lower())
+            if record is not None:
+                return Contact(*record)
+        return contact
+
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        names = list(names)
+        results = self.engine.search_many(names)
+        if self._snapshot is not None:
+            for i, contact in enumerate(results):
+                if contact is None:
+                    record = self._from_snapshot(names[i].strip().lower())
+                    if record is not None:
+                        results[i] = Contact(*record)
+        return results
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        contacts = self.engine.list_all_contacts(sorted_by_name)
+        if self._snapshot is None:
+            return contacts
+        if sorted_by_name:
+            return list(heapq.merge(contacts, self._snapshot_contacts(), key=attrgetter('name')))
+        return contacts + list(self._snapshot_contacts())
+
+    def iter_contacts(self, sorted: bool = True, start_after: Optional[str] = None,
+                      limit: Optional[int] = None) -> Iterator[Contact]:
+        if self._snapshot is None:
+            return self.engine.iter_contacts(sorted, start_after, limit)
+        after = start_after.strip().lower() if start_after is not None else None
+        if not sorted and not self.ITERATES_IN_ORDER:
+            if after is not None:
+                raise ValueError("start_after needs sorted=True on an engine that isn't ordered by name")
+            return islice(iter(self), limit)
+        return islice(heapq.merge(self.engine.iter_contacts(True, start_after), self._snapshot_contacts(after),
+                                  key=attrgetter('name')), limit)
+
+    def __iter__(self) -> Iterator[Contact]:
+        if self._snapshot is None:
+            return iter(self.engine)
+        if self.engine.ITERATES_IN_ORDER:
+            return heapq.merge(self.engine, self._snapshot_contacts(), key=attrgetter('name'))
+        return chain(self.engine, self._snapshot_contacts())
+
+    @property
+    def ITERATES_IN_ORDER(self) -> bool:
+        return self.engine.ITERATES_IN_ORDER
+
+    @property
+    def size(self) -> int:
+        return self.engine.size + self._snapshot_live
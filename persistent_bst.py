@@ -0,0 +1,289 @@
+import heapq
+from operator import attrgetter
+from typing import List, Optional, Dict, Iterable, Iterator, Set, Tuple
+from helper import (Contact, BulkInsertResult, BatchOperationsMixin, MemoryReport, PaginationMixin, ProbeLookupMixin,
+                    probe_binary_tree, dedupe_new_contacts)
+from indexes import SecondaryIndex, SecondaryIndexMixin
+
+class PNode:
+    """Immutable AVL node: never changed once linked, so any number of versions can share it"""
+    __slots__ = ('contact', 'left', 'right', 'height')
+
+    def __init__(self, contact: Contact, left: Optional['PNode'], right: Optional['PNode']):
+        self.contact = contact
+        self.left = left
+        self.right = right
+        self.height = 1 + max(left.height if left is not None else 0, right.height if right is not None else 0)
+
+class Version:
+    """One published state of the tree: root and size are set together, once"""
+    __slots__ = ('root', 'size')
+
+    def __init__(self, root: Optional[PNode], size: int):
+        self.root = root
+        self.size = size
+
+EMPTY = Version(None, 0)
+
+def _height(node: Optional[PNode]) -> int:
+    return node.height if node is not None else 0
+
+def _balanced(contact: Contact, left: Optional[PNode], right: Optional[PNode]) -> PNode:
+    """New node over left and right, rotated if their heights differ by 2 (AVL rebalancing)"""
+    left_height, right_height = _height(left), _height(right)
+    if left_height > right_height + 1:
+        if _height(left.left) >= _height(left.right):
+            return PNode(left.contact, left.left, PNode(contact, left.right, right))
+        pivot = left.right
+        return PNode(pivot.contact, PNode(left.contact, left.left, pivot.left), PNode(contact, pivot.right, right))
+    if right_height > left_height + 1:
+        if _height(right.right) >= _height(right.left):
+            return PNode(right.contact, PNode(contact, left, right.left), right.right)
+        pivot = right.left
+        return PNode(pivot.contact, PNode(contact, left, pivot.left), PNode(right.contact, pivot.right, right.right))
+    return PNode(contact, left, right)
+
+def _insert(node: Optional[PNode], contact: Contact) -> Optional[PNode]:
+    # Returns the new subtree, or the same node object when the name already exists
+    if node is None:
+        return PNode(contact, None, None)
+    if contact.name == node.contact.name:
+        return node
+    if contact.name < node.contact.name:
+        left = _insert(node.left, contact)
+        return node if left is node.left else _balanced(node.contact, left, node.right)
+    right = _insert(node.right, contact)
+    return node if right is node.right else _balanced(node.contact, node.left, right)
+
+def _pop_min(node: PNode) -> Tuple[Contact, Optional[PNode]]:
+    if node.left is None:
+        return node.contact, node.right
+    contact, left = _pop_min(node.left)
+    return contact, _balanced(node.contact, left, node.right)
+
+def _delete(node: Optional[PNode], name: str) -> Optional[PNode]:
+    # Returns the new subtree, or the same node object when name isn't present
+    if node is None:
+        return None
+    if name < node.contact.name:
+        left = _delete(node.left, name)
+        return node if left is node.left else _balanced(node.contact, left, node.right)
+    if name > node.contact.name:
+        right = _delete(node.right, name)
+        return node if right is node.right else _balanced(node.contact, node.left, right)
+    if node.left is None:
+        return node.right
+    if node.right is None:
+        return node.left
+    # The successor moves up into a new node; the removed node itself is left untouched
+    successor, right = _pop_min(node.right)
+    return _balanced(successor, node.left, right)
+
+def _replace(node: PNode, contact: Contact) -> PNode:
+    # Path copy down to the node holding contact.name (which must exist); shape is unchanged
+    if contact.name == node.contact.name:
+        return PNode(contact, node.left, node.right)
+    if contact.name < node.contact.name:
+        return PNode(node.contact, _replace(node.left, contact), node.right)
+    return PNode(node.contact, node.left, _replace(node.right, contact))
+
+def _build(contacts: List[Contact], lo: int, hi: int) -> Optional[PNode]:
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    return PNode(contacts[mid], _build(contacts, lo, mid), _build(contacts, mid + 1, hi))
+
+
+class PersistentTreeView(SecondaryIndexMixin, PaginationMixin, ProbeLookupMixin):
+    """
+    Read-only operations over one Version of a persistent tree.
+
+    Versions never change after they are built, so a view can be read from any thread
+    without locks while the engine keeps writing. Returned Contact objects are shared
+    with other versions and must be treated as read-only.
+    """
+
+    ITERATES_IN_ORDER = True
+
+    def __init__(self, version: Version):
+        self.version = version
+
+    @property
+    def root(self) -> Optional[PNode]:
+        return self.version.root
+
+    @property
+    def size(self) -> int:
+        return self.version.size
+
+    def _find_node(self, name: str) -> Optional[PNode]:
+        node = self.root
+        while node is not None:
+            if name == node.contact.name:
+                return node
+            node = node.left if name < node.contact.name else node.right
+        return None
+
+    def search(self, name: str) -> Optional[Contact]:
+        node = self._find_node(name.strip().lower())
+        return node.contact if node is not None else None
+
+    def iter_from(self, name: str) -> Iterator[Contact]:
+        """Contacts with name >= the given name, in name order"""
+        search_name = name.strip().lower()
+        stack = []
+        node = self.root
+        while node is not None:
+            if node.contact.name >= search_name:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        while stack:
+            node = stack.pop()
+            yield node.contact
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def range(self, lo: str, hi: str) -> List[Contact]:
+        """Contacts with lo <= name < hi (names are normalized before comparing)"""
+        upper = hi.strip().lower()
+        results = []
+        for contact in self.iter_from(lo):
+            if contact.name >= upper:
+                break
+            results.append(contact)
+        return results
+
+    def height(self) -> int:
+        return _height(self.root)
+
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        return probe_binary_tree(self.root, search_name)
+
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by this version, by category (shared nodes are counted in every version)"""
+        report = MemoryReport()
+        root = self.root
+        stack = [root] if root is not None else []
+        while stack:
+            node = stack.pop()
+            report.add('nodes', node)
+            report.add_contact(node.contact)
+            stack.extend(child for child in (node.left, node.right) if child is not None)
+        if self.index is not None:
+            self.index.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.contact
+            node = node.right
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        return list(self)
+
+
+class PersistentBstImpl(PersistentTreeView, BatchOperationsMixin):
+    """
+    Path-copying AVL tree: every write builds new nodes along one root-to-leaf path and
+    shares all other subtrees with the previous version, then publishes the new root and
+    size together as one Version with a single assignment.
+
+    snapshot() is O(1) and returns a PersistentTreeView of the current version that stays
+    consistent however many writes follow. A version's nodes are freed (by reference
+    counting) once no snapshot refers to them. Writes cost O(log n) new nodes; concurrent
+    writers still need a lock (e.g. ConcurrentStore), readers of snapshots never do.
+    Secondary indexes, when enabled, track the latest version only.
+    """
+
+    def __init__(self, indexed: bool = False, fuzzy: bool = False):
+        super().__init__(EMPTY)
+        self.index: Optional[SecondaryIndex] = SecondaryIndex(fuzzy) if indexed or fuzzy else None
+
+    def snapshot(self) -> PersistentTreeView:
+        return PersistentTreeView(self.version)
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        new_contact = Contact(name, phone, email)
+        version = self.version
+        root = _insert(version.root, new_contact)
+        if root is version.root:
+            return False
+
+        self.version = Version(root, version.size + 1)
+        if self.index is not None:
+            self.index.add(new_contact)
+        return True
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        result = BulkInsertResult()
+        existing = list(self)
+        new_contacts = list(dedupe_new_contacts(contacts, {contact.name for contact in existing}, result))
+
+        if new_contacts:
+            # Rebuilding is O(n) and shares no nodes, but snapshots keep the old tree intact
+            by_name = attrgetter('name')
+            new_contacts.sort(key=by_name)
+            merged = list(heapq.merge(existing, new_contacts, key=by_name)) if existing else new_contacts
+            self.version = Version(_build(merged, 0, len(merged)), len(merged))
+
+        if self.index is not None:
+            for contact in new_contacts:
+                self.index.add(contact)
+        return result
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        contact = self.search(name)
+        if contact is None:
+            return False
+
+        # A new Contact, never an in-place change: older versions still hold the old one
+        self._apply_update(contact, phone, email)
+        return True
+
+    def _apply_update(self, contact: Contact, phone: Optional[str], email: Optional[str]) -> None:
+        new_contact = Contact(contact.name, phone if phone is not None else contact.phone,
+                              email if email is not None else contact.email)
+        version = self.version
+        self.version = Version(_replace(version.root, new_contact), version.size)
+        if self.index is not None:
+            self.index.remove(contact, keep_name=True)
+            self.index.add(new_contact)
+
+    def delete(self, name: str) -> bool:
+        search_name = name.strip().lower()
+        contact = self.search(search_name)
+        if contact is None:
+            return False
+
+        version = self.version
+        self.version = Version(_delete(version.root, search_name), version.size - 1)
+        if self.index is not None:
+            self.index.remove(contact)
+        return True
+
+    def _search_keys(self, keys: Set[str]) -> Dict[str, Contact]:
+        # Read one version for the whole batch
+        view = self.snapshot()
+        found = {}
+        for key in keys:
+            contact = view.search(key)
+            if contact is not None:
+                found[key] = contact
+        return found
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        # Per item: each update replaces the contact, so a name repeated in the batch must see the last one
+        return [self.update(name, phone, email) for name, phone, email in updates]
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        return [self.delete(name) for name in names]
@@ -0,0 +1,265 @@
+from typing import List, Optional, Dict, Iterable, Iterator, Set, Tuple
+from helper import Contact, BulkInsertResult, BatchOperationsMixin, MemoryReport, PaginationMixin, ProbeLookupMixin
+from indexes import SecondaryIndex, SecondaryIndexMixin
+
+class RadixNode:
+    __slots__ = ('label', 'children', 'contact', 'ordered')
+
+    def __init__(self, label: str, contact: Optional[Contact] = None):
+        self.label = label  # Edge label leading into this node
+        self.children: Dict[str, 'RadixNode'] = {}  # Keyed by the first character of the child's label
+        self.contact = contact
+        # Children in descending edge order (ready to push on a DFS stack); None until needed after a change
+        self.ordered: Optional[List['RadixNode']] = None
+
+class RadixTreeImpl(SecondaryIndexMixin, BatchOperationsMixin, PaginationMixin, ProbeLookupMixin):
+    """Compressed trie over normalized names; autocomplete(prefix, k) walks the prefix then yields k names"""
+
+    ITERATES_IN_ORDER = True
+
+    def __init__(self, indexed: bool = False, fuzzy: bool = False):
+        self.root = RadixNode('')
+        self.size = 0
+        self.index: Optional[SecondaryIndex] = SecondaryIndex(fuzzy) if indexed or fuzzy else None
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        new_contact = Contact(name, phone, email)
+        if not self._insert_contact(new_contact):
+            return False
+
+        if self.index is not None:
+            self.index.add(new_contact)
+        self.size += 1
+        return True
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        # The tree itself detects duplicates during the descent, so no separate lookup is needed
+        result = BulkInsertResult()
+        for name, phone, email in contacts:
+            new_contact = Contact(name, phone, email)
+            if not self._insert_contact(new_contact):
+                result.rejected.append(name)
+                continue
+            if self.index is not None:
+                self.index.add(new_contact)
+            result.inserted += 1
+
+        self.size += result.inserted
+        return result
+
+    def _insert_contact(self, contact: Contact) -> bool:
+        key = contact.name
+        node = self.root
+        i = 0
+        while True:
+            if i == len(key):
+                if node.contact is not None:
+                    return False
+                node.contact = contact
+                return True
+
+            child = node.children.get(key[i])
+            if child is None:
+                node.children[key[i]] = RadixNode(key[i:], contact)
+                node.ordered = None
+                return True
+
+            label = child.label
+            common = 0
+            limit = min(len(label), len(key) - i)
+            while common < limit and label[common] == key[i + common]:
+                common += 1
+
+            if common < len(label):
+                # Split the edge: the shared part becomes a new inner node
+                middle = RadixNode(label[:common])
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                node.children[key[i]] = middle
+                node.ordered = None
+                child = middle
+            node = child
+            i += common
+
+    def _find_node(self, key: str) -> Optional[RadixNode]:
+        node = self.root
+        i = 0
+        while i < len(key):
+            node = node.children.get(key[i])
+            if node is None or not key.startswith(node.label, i):
+                return None
+            i += len(node.label)
+        return node
+
+    def search(self, name: str) -> Optional[Contact]:
+        node = self._find_node(name.strip().lower())
+        return node.contact if node is not None else None
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        contact = self.search(name)
+        if contact is None:
+            return False
+
+        self._apply_update(contact, phone, email)
+        return True
+
+    def delete(self, name: str) -> bool:
+        key = name.strip().lower()
+        parent = None
+        node = self.root
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None or not key.startswith(child.label, i):
+                return False
+            parent, node = node, child
+            i += len(child.label)
+        if node.contact is None:
+            return False
+
+        if self.index is not None:
+            self.index.remove(node.contact)
+        node.contact = None
+        if parent is not None:
+            if not node.children:
+                del parent.children[node.label[0]]
+                parent.ordered = None
+                # The parent may now be a pass-through node that can be merged into its only child
+                if parent is not self.root and parent.contact is None and len(parent.children) == 1:
+                    self._merge_with_child(parent)
+            elif len(node.children) == 1:
+                self._merge_with_child(node)
+        self.size -= 1
+        return True
+
+    def _search_keys(self, keys: Set[str]) -> Dict[str, Contact]:
+        found = {}
+        for key in keys:
+            node = self._find_node(key)
+            if node is not None and node.contact is not None:
+                found[key] = node.contact
+        return found
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        # Each delete already costs only O(len(name)), so the batch is a plain loop
+        return [self.delete(name) for name in names]
+
+    @staticmethod
+    def _merge_with_child(node: RadixNode) -> None:
+        (child,) = node.children.values()
+        node.label += child.label
+        node.children = child.children
+        node.contact = child.contact
+        node.ordered = child.ordered
+
+    @staticmethod
+    def _ordered(node: RadixNode) -> List[RadixNode]:
+        # Children by descending edge character, cached until the children change
+        ordered = node.ordered
+        if ordered is None:
+            ordered = node.ordered = [node.children[c] for c in sorted(node.children, reverse=True)]
+        return ordered
+
+    def _walk(self, stack: List[RadixNode]) -> Iterator[Contact]:
+        # Preorder over children sorted by edge character yields names in lexicographic order
+        while stack:
+            node = stack.pop()
+            if node.contact is not None:
+                yield node.contact
+            if node.children:
+                stack.extend(self._ordered(node))
+
+    def _iter_from(self, node: RadixNode) -> Iterator[Contact]:
+        return self._walk([node])
+
+    def iter_from(self, name: str) -> Iterator[Contact]:
+        """Contacts with name >= the given name, in name order"""
+        key = name.strip().lower()
+        # On the way down, stack every subtree that sorts wholly after key; deeper ones
+        # are smaller, so they end up on top
+        stack = []
+        node = self.root
+        i = 0
+        while i < len(key):
+            stack.extend(child for child in self._ordered(node) if child.label[0] > key[i])
+            child = node.children.get(key[i])
+            if child is None:
+                return self._walk(stack)
+            segment = key[i:i + len(child.label)]
+            if segment != child.label:
+                # Key diverges from (or ends inside) this edge: the subtree is wholly before or after it
+                if child.label > segment:
+                    stack.append(child)
+                return self._walk(stack)
+            node = child
+            i += len(child.label)
+        stack.append(node)  # Path spells out key exactly: node and all its descendants qualify
+        return self._walk(stack)
+
+    def autocomplete(self, prefix: str, k: int = 10) -> List[Contact]:
+        """Up to k contacts whose name starts with prefix, in name order"""
+        key = prefix.strip().lower()
+        node = self.root
+        i = 0
+        while i < len(key):
+            node = node.children.get(key[i])
+            if node is None:
+                return []
+            label = node.label
+            remaining = len(key) - i
+            if remaining <= len(label):
+                # Prefix ends inside (or at the end of) this edge
+                if not label.startswith(key[i:]):
+                    return []
+                break
+            if not key.startswith(label, i):
+                return []
+            i += len(label)
+
+        results = []
+        for contact in self._iter_from(node):
+            if len(results) >= k:
+                break
+            results.append(contact)
+        return results
+
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        # Mirrors _find_node; one comparison per edge label matched against the key
+        visited = comparisons = 0
+        node = self.root
+        i = 0
+        while i < len(search_name):
+            node = node.children.get(search_name[i])
+            visited += 1
+            if node is None:
+                break
+            comparisons += 1
+            if not search_name.startswith(node.label, i):
+                break
+            i += len(node.label)
+        return visited, comparisons
+
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the structure, by category (walks every entry)"""
+        report = MemoryReport()
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            report.add('nodes', node)
+            report.add('nodes', node.children)
+            if node.ordered is not None:
+                report.add('nodes', node.ordered)
+            if node.contact is not None:
+                report.add_contact(node.contact)
+            report.add('strings', node.label)
+            stack.extend(node.children.values())
+        if self.index is not None:
+            self.index.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        return self._iter_from(self.root)
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        # Traversal is already in name order
+        return list(self._iter_from(self.root))
@@ -0,0 +1,243 @@
+import heapq
+import multiprocessing
+import os
+import zlib
+from operator import attrgetter
+from typing import List, Optional, Iterable, Iterator, Tuple, Callable, Any
+from helper import Contact, BulkInsertResult, merge_pages
+from fuzzy import merge_fuzzy_results
+from hash_map import HashMapImpl
+
+# Read-only engine methods a batch may call; anything else is treated as a write
+READ_METHODS = ('search', 'find_by_phone', 'find_by_email', 'find_by_domain', 'search_fuzzy', 'list_all_contacts',
+                'iter_contacts')
+BATCH_METHODS = READ_METHODS + ('insert', 'update', 'delete', 'bulk_insert')
+
+
+def _detach(value: Any) -> Any:
+    # Replies are pickled only after the whole batch ran, so copy contacts now or a later
+    # update in the same batch would show through an earlier search result
+    if isinstance(value, Contact):
+        return Contact(value.name, value.phone, value.email)
+    if isinstance(value, Iterator):
+        value = list(value)  # iter_contacts() pages can't be pickled lazily
+    if isinstance(value, list) and any(isinstance(c, Contact) for c in value):
+        # search_many results may hold None for missing names
+        return [Contact(c.name, c.phone, c.email) if c is not None else None for c in value]
+    return value
+
+
+def _shard_worker(conn, engine_factory: Callable) -> None:
+    """Worker loop: receive a list of (method, args, kwargs) calls, reply with [(ok, value), ...]"""
+    engine = engine_factory()
+    while True:
+        calls = conn.recv()
+        if calls is None:
+            break
+        replies = []
+        for method, args, kwargs in calls:
+            try:
+                if method == 'size':
+                    replies.append((True, engine.size))
+                else:
+                    replies.append((True, _detach(getattr(engine, method)(*args, **kwargs))))
+            except Exception as e:  # Reported back to the caller instead of killing the shard
+                replies.append((False, f"{type(e).__name__}: {e}"))
+        conn.send(replies)
+    conn.close()
+
+
+class ShardedStore:
+    """
+    Contacts partitioned by name hash across worker processes, each owning an engine.
+
+    Single calls cost one round trip to one shard. execute_batch() groups operations per
+    shard, sends every shard its group before waiting on any reply, and returns results
+    in the original order, which amortizes IPC and lets the shards work in parallel.
+    Contacts come back as pickled copies, so changes must go through update().
+    Not thread-safe: use one store per thread (or guard it).
+    """
+
+    ITERATES_IN_ORDER = False
+
+    def __init__(self, workers: Optional[int] = None, engine_factory: Callable = HashMapImpl,
+                 start_method: Optional[str] = None):
+        workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context(start_method)
+        self._connections = []
+        self._processes = []
+        for _ in range(workers):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_shard_worker, args=(child_conn, engine_factory), daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    @property
+    def workers(self) -> int:
+        return len(self._connections)
+
+    def _shard(self, name: str) -> int:
+        if not self._connections:
+            raise RuntimeError("ShardedStore is closed")
+        # crc32 rather than hash(): str hashes are salted per process
+        return zlib.crc32(name.strip().lower().encode()) % len(self._connections)
+
+    def _call_shards(self, calls_by_shard: List[List[Tuple[str, tuple, dict]]]) -> List[List[Any]]:
+        """
+        Send every shard its calls, then collect one reply from each shard that got any.
+        All replies are read before a failed operation is raised, so no stale reply is
+        left in a pipe for the next call; the other operations have run by then. A worker
+        that can't be reached leaves the pipes out of step, so the store closes itself.
+        """
+        if not self._connections:
+            raise RuntimeError("ShardedStore is closed")
+        try:
+            for conn, calls in zip(self._connections, calls_by_shard):
+                if calls:
+                    conn.send(calls)
+            replies = [conn.recv() if calls else [] for conn, calls in zip(self._connections, calls_by_shard)]
+        except (EOFError, OSError) as e:
+            self.close()
+            raise RuntimeError(f"shard worker unreachable, store closed: {type(e).__name__}: {e}") from e
+
+        results = []
+        failure = None
+        for shard_replies in replies:
+            values = []
+            for ok, value in shard_replies:
+                if not ok and failure is None:
+                    failure = value
+                values.append(value)
+            results.append(values)
+        if failure is not None:
+            raise RuntimeError(f"shard operation failed: {failure}")
+        return results
+
+    def _call_one(self, name: str, method: str, *args, **kwargs) -> Any:
+        calls = [[] for _ in self._connections]
+        shard = self._shard(name)
+        calls[shard].append((method, (name,) + args, kwargs))
+        return self._call_shards(calls)[shard][0]
+
+    def _call_all(self, method: str, *args) -> List[Any]:
+        return [values[0] for values in self._call_shards([[(method, args, {})] for _ in self._connections])]
+
+    def execute_batch(self, operations: Iterable[Tuple]) -> List[Any]:
+        """
+        Run many (method, name, *args) operations, e.g. ('search', 'Ann') or
+        ('update', 'Ann', '555-0000', None), with one round trip per shard.
+        Operations on the same name run in their original relative order.
+        """
+        calls = [[] for _ in self._connections]
+        positions = []
+        for operation in operations:
+            method, name, *args = operation
+            if method not in BATCH_METHODS:
+                raise ValueError(f"unsupported batch method {method!r}")
+            shard = self._shard(name)
+            positions.append((shard, len(calls[shard])))
+            calls[shard].append((method, (name, *args), {}))
+
+        results = self._call_shards(calls)
+        return [results[shard][i] for shard, i in positions]
+
+    def _call_many(self, method: str, items: List[tuple], unpack) -> List[Any]:
+        # One engine *_many call per shard, results scattered back into input order
+        groups = [[] for _ in self._connections]
+        positions = []
+        for item in items:
+            shard = self._shard(item[0])
+            positions.append((shard, len(groups[shard])))
+            groups[shard].append(item)
+        calls = [[(method, (unpack(group),), {})] if group else [] for group in groups]
+        results = [values[0] if values else [] for values in self._call_shards(calls)]
+        return [results[shard][i] for shard, i in positions]
+
+    def search_many(self, names: Iterable[str]) -> List[Optional[Contact]]:
+        return self._call_many('search_many', [(name,) for name in names],
+                               lambda group: [item[0] for item in group])
+
+    def update_many(self, updates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[bool]:
+        return self._call_many('update_many', list(updates), list)
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        return self._call_many('delete_many', [(name,) for name in names],
+                               lambda group: [item[0] for item in group])
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        return self._call_one(name, 'insert', phone, email)
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        batches = [[] for _ in self._connections]
+        for contact in contacts:
+            batches[self._shard(contact[0])].append(contact)
+
+        calls = [[('bulk_insert', (batch,), {})] if batch else [] for batch in batches]
+        result = BulkInsertResult()
+        for values in self._call_shards(calls):
+            for shard_result in values:
+                result.inserted += shard_result.inserted
+                result.rejected.extend(shard_result.rejected)
+        return result
+
+    def search(self, name: str) -> Optional[Contact]:
+        return self._call_one(name, 'search')
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        return self._call_one(name, 'update', phone, email)
+
+    def delete(self, name: str) -> bool:
+        return self._call_one(name, 'delete')
+
+    def find_by_phone(self, phone: str) -> Optional[Contact]:
+        return next((c for c in self._call_all('find_by_phone', phone) if c is not None), None)
+
+    def find_by_email(self, email: str) -> Optional[Contact]:
+        return next((c for c in self._call_all('find_by_email', email) if c is not None), None)
+
+    def find_by_domain(self, domain: str) -> List[Contact]:
+        return [c for part in self._call_all('find_by_domain', domain) for c in part]
+
+    def search_fuzzy(self, name: str, max_distance: int = 2, limit: Optional[int] = 10) -> List[Contact]:
+        return merge_fuzzy_results(name, self._call_all('search_fuzzy', name, max_distance, limit), limit)
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        parts = self._call_all('list_all_contacts', sorted_by_name)
+        if sorted_by_name:
+            return list(heapq.merge(*parts, key=attrgetter('name')))
+        return [contact for part in parts for contact in part]
+
+    def iter_contacts(self, sorted: bool = True, start_after: Optional[str] = None,
+                      limit: Optional[int] = None) -> Iterator[Contact]:
+        # One page (of up to limit) per shard, merged here
+        return iter(merge_pages(self._call_all('iter_contacts', sorted, start_after, limit), sorted, limit))
+
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self.list_all_contacts())
+
+    @property
+    def size(self) -> int:
+        return sum(self._call_all('size'))
+
+    def close(self) -> None:
+        for conn in self._connections:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self) -> 'ShardedStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,258 @@
+import heapq
+import random
+from operator import attrgetter
+from typing import List, Optional, Dict, Iterable, Iterator, Set, Tuple
+from helper import (Contact, BulkInsertResult, BatchOperationsMixin, batch_delete_results, MemoryReport,
+                    PaginationMixin, ProbeLookupMixin, dedupe_new_contacts)
+from indexes import SecondaryIndex, SecondaryIndexMixin
+
+class SkipNode:
+    __slots__ = ('name', 'contact', 'next')
+
+    def __init__(self, contact: Optional[Contact], level: int):
+        # Same string object as contact.name, kept here to save an attribute hop per comparison
+        self.name = contact.name if contact is not None else ''
+        self.contact = contact
+        self.next: List[Optional['SkipNode']] = [None] * level  # Forward pointer per level, 0 = every node
+
+class SkipListImpl(SecondaryIndexMixin, BatchOperationsMixin, PaginationMixin, ProbeLookupMixin):
+    """
+    Probabilistic skip list ordered by normalized name: expected O(log n) search, insert
+    and delete, and in-order iteration by following level-0 pointers.
+
+    Writers link a new node bottom-up after filling in its own pointers and unlink top-down
+    without clearing the removed node's pointers, so under CPython a single writer never
+    leaves a half-linked list for readers walking it. Concurrent writers still need a
+    lock (e.g. ConcurrentStore).
+    """
+
+    ITERATES_IN_ORDER = True
+
+    def __init__(self, max_level: int = 32, p: float = 0.25, seed: Optional[int] = None,
+                 indexed: bool = False, fuzzy: bool = False):
+        if not 0.0 < p < 1.0:
+            raise ValueError("p must be in (0, 1)")
+        self.max_level = max_level
+        self.p = p
+        self.random = random.Random(seed)
+        self.head = SkipNode(None, max_level)
+        self.level = 1  # Levels currently in use
+        self.size = 0
+        self.index: Optional[SecondaryIndex] = SecondaryIndex(fuzzy) if indexed or fuzzy else None
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.max_level and self.random.random() < self.p:
+            level += 1
+        return level
+
+    def _predecessors(self, name: str) -> List[SkipNode]:
+        # Rightmost node before name on every level, from the top level in use down to 0
+        update = [self.head] * self.max_level
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            nxt = node.next[i]
+            while nxt is not None and nxt.name < name:
+                node = nxt
+                nxt = node.next[i]
+            update[i] = node
+        return update
+
+    def _lower_bound(self, name: str) -> Optional[SkipNode]:
+        """First node whose name is >= name"""
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            nxt = node.next[i]
+            while nxt is not None and nxt.name < name:
+                node = nxt
+                nxt = node.next[i]
+        return node.next[0]
+
+    def insert(self, name: str, phone: str, email: str) -> bool:
+        new_contact = Contact(name, phone, email)
+        if not self._insert_contact(new_contact):
+            return False
+
+        if self.index is not None:
+            self.index.add(new_contact)
+        self.size += 1
+        return True
+
+    def _insert_contact(self, contact: Contact) -> bool:
+        update = self._predecessors(contact.name)
+        nxt = update[0].next[0]
+        if nxt is not None and nxt.name == contact.name:
+            return False
+
+        level = self._random_level()
+        node = SkipNode(contact, level)
+        for i in range(level):
+            node.next[i] = update[i].next[i]
+        for i in range(level):
+            update[i].next[i] = node
+        if level > self.level:
+            self.level = level
+        return True
+
+    def bulk_insert(self, contacts: Iterable[Tuple[str, str, str]]) -> BulkInsertResult:
+        result = BulkInsertResult()
+        new_contacts = list(dedupe_new_contacts(contacts, {contact.name for contact in self}, result))
+
+        if new_contacts:
+            # Sort the batch, merge with the existing order and relink everything in one O(n) pass
+            by_name = attrgetter('name')
+            new_contacts.sort(key=by_name)
+            merged = heapq.merge(self, new_contacts, key=by_name) if self.size else new_contacts
+            self._build(list(merged))
+
+        if self.index is not None:
+            for contact in new_contacts:
+                self.index.add(contact)
+        self.size += result.inserted
+        return result
+
+    def _build(self, contacts: List[Contact]) -> None:
+        # Append in order, keeping the last node seen on each level; the new head is
+        # published at the end so readers see either the old list or the complete new one
+        head = SkipNode(None, self.max_level)
+        tails = [head] * self.max_level
+        top = 1
+        for contact in contacts:
+            level = self._random_level()
+            node = SkipNode(contact, level)
+            for i in range(level):
+                tails[i].next[i] = node
+                tails[i] = node
+            if level > top:
+                top = level
+        self.level = top
+        self.head = head
+
+    def search(self, name: str) -> Optional[Contact]:
+        search_name = name.strip().lower()
+        node = self._lower_bound(search_name)
+        if node is not None and node.name == search_name:
+            return node.contact
+        return None
+
+    def update(self, name: str, phone: str = None, email: str = None) -> bool:
+        contact = self.search(name)
+        if contact is None:
+            return False
+
+        self._apply_update(contact, phone, email)
+        return True
+
+    def delete(self, name: str) -> bool:
+        search_name = name.strip().lower()
+        update = self._predecessors(search_name)
+        node = update[0].next[0]
+        if node is None or node.name != search_name:
+            return False
+
+        self._unlink(node, update)
+        if self.index is not None:
+            self.index.remove(node.contact)
+        self.size -= 1
+        return True
+
+    def _unlink(self, node: SkipNode, update: List[SkipNode]) -> None:
+        for i in range(len(node.next) - 1, -1, -1):
+            update[i].next[i] = node.next[i]
+        while self.level > 1 and self.head.next[self.level - 1] is None:
+            self.level -= 1
+
+    def _search_keys(self, keys: Set[str]) -> Dict[str, Contact]:
+        # Sorted keys are looked up with one forward walk: the predecessors of one key are
+        # valid starting points for the next, so each level is traversed at most once
+        found = {}
+        update = [self.head] * self.max_level
+        for key in sorted(keys):
+            node = update[self.level - 1]
+            for i in range(self.level - 1, -1, -1):
+                # Continue from whichever is further along: the level above or this level's old spot
+                start = update[i]
+                if start.name > node.name:
+                    node = start
+                nxt = node.next[i]
+                while nxt is not None and nxt.name < key:
+                    node = nxt
+                    nxt = node.next[i]
+                update[i] = node
+            nxt = node.next[0]
+            if nxt is not None and nxt.name == key:
+                found[key] = nxt.contact
+        return found
+
+    def delete_many(self, names: Iterable[str]) -> List[bool]:
+        keys = [name.strip().lower() for name in names]
+        found = self._search_keys(set(keys))
+        for search_name in found:
+            self.delete(search_name)
+        return batch_delete_results(keys, set(found))
+
+    def iter_from(self, name: str) -> Iterator[Contact]:
+        """Contacts with name >= the given name, in name order (one descent, then O(1) per step)"""
+        node = self._lower_bound(name.strip().lower())
+        while node is not None:
+            yield node.contact
+            node = node.next[0]
+
+    def range(self, lo: str, hi: str) -> List[Contact]:
+        """Contacts with lo <= name < hi (names are normalized before comparing)"""
+        upper = hi.strip().lower()
+        results = []
+        for contact in self.iter_from(lo):
+            if contact.name >= upper:
+                break
+            results.append(contact)
+        return results
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[Contact]:
+        """Contacts whose name starts with prefix (at most limit of them, in name order)"""
+        search_prefix = prefix.strip().lower()
+        results = []
+        for contact in self.iter_from(search_prefix):
+            if (limit is not None and len(results) >= limit) or not contact.name.startswith(search_prefix):
+                break
+            results.append(contact)
+        return results
+
+    def _probe_lookup(self, search_name: str) -> Tuple[int, int]:
+        # Mirrors _lower_bound plus the final equality check
+        visited = comparisons = 0
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            nxt = node.next[i]
+            while nxt is not None:
+                visited += 1
+                comparisons += 1
+                if not nxt.name < search_name:
+                    break
+                node = nxt
+                nxt = node.next[i]
+        return visited, comparisons + (1 if node.next[0] is not None else 0)
+
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the structure, by category (walks every entry)"""
+        report = MemoryReport()
+        node = self.head
+        while node is not None:
+            report.add('nodes', node)
+            report.add('nodes', node.next)
+            if node.contact is not None:
+                report.add_contact(node.contact)
+            node = node.next[0]
+        if self.index is not None:
+            self.index.add_to_report(report)
+        return report
+
+    def __iter__(self) -> Iterator[Contact]:
+        node = self.head.next[0]
+        while node is not None:
+            yield node.contact
+            node = node.next[0]
+
+    def list_all_contacts(self, sorted_by_name: bool = False) -> List[Contact]:
+        # Level 0 is already sorted by name
+        return list(self)
@@ -0,0 +1,88 @@
+import math
+import random
+
+import pytest
+
+from bst import BstImpl
+
+
+def check_order(node, lo=None, hi=None):
+    if node is None:
+        return 0
+    assert (lo is None or node.contact.name > lo) and (hi is None or node.contact.name < hi)
+    return 1 + check_order(node.left, lo, node.contact.name) + check_order(node.right, node.contact.name, hi)
+
+
+def check_avl(node):
+    if node is None:
+        return 0
+    left, right = check_avl(node.left), check_avl(node.right)
+    assert abs(left - right) <= 1
+    assert node.height == 1 + max(left, right)
+    return node.height
+
+
+def check_red_black(node, parent_red=False):
+    # Left-leaning red-black: no red right links, no two reds in a row, equal black height
+    if node is None:
+        return 1
+    assert not BstImpl._is_red(node.right)
+    assert not (parent_red and node.red)
+    left, right = check_red_black(node.left, node.red), check_red_black(node.right, node.red)
+    assert left == right
+    return left + (0 if node.red else 1)
+
+
+def random_writes(tree, rnd, steps, model=None):
+    model = set() if model is None else model
+    for _ in range(steps):
+        name = f"person {rnd.randrange(500):03d}"
+        if rnd.random() < 0.6:
+            assert tree.insert(name, "555-0000", "p@example.com") == (name not in model)
+            model.add(name)
+        else:
+            assert tree.delete(name) == (name in model)
+            model.discard(name)
+    return model
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_avl_invariants_after_random_writes(seed):
+    tree = BstImpl(balance='avl')
+    model = random_writes(tree, random.Random(seed), 3000)
+    assert check_order(tree.root) == tree.size == len(model)
+    check_avl(tree.root)
+    assert [c.name for c in tree] == sorted(model)
+    assert tree.height() <= 1.45 * math.log2(len(model) + 2)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_red_black_invariants_after_random_writes(seed):
+    tree = BstImpl(balance='red_black')
+    model = random_writes(tree, random.Random(seed), 3000)
+    assert check_order(tree.root) == tree.size == len(model)
+    assert not BstImpl._is_red(tree.root)
+    check_red_black(tree.root)
+    assert [c.name for c in tree] == sorted(model)
+    assert tree.height() <= 2 * math.log2(len(model) + 1)
+
+
+@pytest.mark.parametrize("balance", ['avl', 'red_black'])
+def test_sorted_insertions_stay_logarithmic(balance):
+    tree = BstImpl(balance=balance)
+    for i in range(2000):
+        tree.insert(f"person {i:05d}", "555-0000", "p@example.com")
+    assert tree.height() <= 2 * math.log2(2001)
+
+
+@pytest.mark.parametrize("balance", ['avl', 'red_black'])
+def test_bulk_insert_then_writes_keep_invariants(balance):
+    tree = BstImpl(balance=balance)
+    tree.bulk_insert([(f"person {i:03d}", "555-0000", "p@example.com") for i in range(0, 500, 2)])
+    model = random_writes(tree, random.Random(9), 1000, {f"person {i:03d}" for i in range(0, 500, 2)})
+    assert check_order(tree.root) == tree.size == len(model)
+    if balance == 'avl':
+        check_avl(tree.root)
+    else:
+        check_red_black(tree.root)
+    assert [c.name for c in tree] == sorted(model)
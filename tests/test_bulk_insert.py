@@ -0,0 +1,28 @@
+import pytest
+
+from array_ import ArrayImpl, SortedArrayImpl
+from bst import BstImpl
+from columnar import ColumnarImpl
+from hash_map import HashMapImpl
+from linked_list import LinkedListImpl
+from open_addressing import OpenAddressingImpl
+from persistent_bst import PersistentBstImpl
+from radix_tree import RadixTreeImpl
+from skip_list import SkipListImpl
+
+ENGINES = [ArrayImpl, SortedArrayImpl, BstImpl, lambda: BstImpl(balance='red_black'), ColumnarImpl, HashMapImpl,
+           LinkedListImpl, OpenAddressingImpl, PersistentBstImpl, RadixTreeImpl, SkipListImpl]
+
+
+@pytest.mark.parametrize("factory", ENGINES)
+def test_bulk_insert_rejects_existing_and_repeated_names(factory):
+    engine = factory()
+    engine.insert("Bob", "555-0000", "bob@example.com")
+    result = engine.bulk_insert([("Ann", "555-0001", "ann@example.com"), ("bob", "555-0002", "other@example.com"),
+                                 (" ANN ", "555-0003", "dup@example.com"), ("Cy", "555-0004", "cy@example.com")])
+    assert result.inserted == 2
+    assert result.rejected == ["bob", " ANN "]
+    assert engine.size == 3
+    assert [c.name for c in engine.list_all_contacts(sorted_by_name=True)] == ["ann", "bob", "cy"]
+    assert engine.search("ann").phone == "555-0001"
+    assert engine.search("bob").phone == "555-0000"
@@ -0,0 +1,34 @@
+import io
+import json
+import random
+
+import pytest
+
+from array_ import ArrayImpl
+from columnar import ColumnarImpl
+from contact_io import export_stream
+from hash_map import HashMapImpl
+from open_addressing import OpenAddressingImpl
+
+CONTACTS = [(f"Person {i:04d}", f"555-{i:04d}", f"p{i}@example.com") for i in random.Random(1).sample(range(1000), 250)]
+
+
+@pytest.mark.parametrize("factory", [HashMapImpl, ArrayImpl, ColumnarImpl, OpenAddressingImpl])
+@pytest.mark.parametrize("chunk_size", [1, 7, 250, 1000])
+def test_sorted_export_pages_in_name_order(factory, chunk_size):
+    engine = factory()
+    engine.bulk_insert(CONTACTS)
+    out = io.StringIO()
+    assert export_stream(engine, out, sorted_by_name=True, format='jsonl', chunk_size=chunk_size) == len(CONTACTS)
+
+    names = [json.loads(line)['name'] for line in out.getvalue().splitlines()]
+    assert names == sorted(name.lower() for name, _, _ in CONTACTS)
+
+def test_sorted_export_csv_rows_are_ordered():
+    engine = ColumnarImpl()
+    engine.bulk_insert(CONTACTS)
+    out = io.StringIO()
+    export_stream(engine, out, sorted_by_name=True, chunk_size=10)
+    rows = out.getvalue().splitlines()[1:]
+    names = [row.split(',')[0] for row in rows]
+    assert names == sorted(name.lower() for name, _, _ in CONTACTS)
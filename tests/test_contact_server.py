@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from contact_server import ContactClient, ContactServer, load_test
+from hash_map import HashMapImpl
+
+NAMES = [f"Person {i}" for i in range(20)]
+
+
+def run_load(concurrency, requests, **kwargs):
+    async def run():
+        async with ContactServer(HashMapImpl()) as server:
+            await server.start(port=0)
+            host, port = server.address[:2]
+            async with await ContactClient.connect(host, port, pool_size=2) as client:
+                await client.bulk_insert([(name, "555-0000", f"p{i}@example.com") for i, name in enumerate(NAMES)])
+                return await load_test(client, NAMES, concurrency, requests, **kwargs)
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("concurrency, requests", [(1, 7), (3, 10), (16, 5)])
+def test_load_test_sends_every_request(concurrency, requests):
+    stats = run_load(concurrency, requests)
+    assert stats['requests'] == requests
+    assert stats['requests_per_s'] > 0
+    assert stats['max_us'] >= stats['p50_us'] > 0
+
+
+@pytest.mark.parametrize("concurrency, requests", [(0, 10), (4, 0)])
+def test_load_test_rejects_empty_runs(concurrency, requests):
+    with pytest.raises(ValueError):
+        run_load(concurrency, requests)
+
+
+def test_calls_fail_once_the_server_hangs_up():
+    async def run():
+        hung_up = asyncio.Event()
+
+        async def read_then_hang_up(reader, writer):
+            await reader.read(1)  # Take the first request and close without answering it
+            writer.close()
+            hung_up.set()
+
+        server = await asyncio.start_server(read_then_hang_up, '127.0.0.1', 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        async with server:
+            async with await ContactClient.connect(host, port, pool_size=1) as client:
+                with pytest.raises(ConnectionError):
+                    await asyncio.wait_for(client.search("Ann"), 5)  # Pending when the socket closes
+                await hung_up.wait()
+                with pytest.raises(ConnectionError):
+                    await asyncio.wait_for(client.search("Ann"), 5)  # Issued after the receiver stopped
+    asyncio.run(run())
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from open_addressing import EMPTY, OpenAddressingImpl, RobinHoodTable
+
+
+class CollidingImpl(OpenAddressingImpl):
+    # Few distinct hashes, so clusters are long and full-name checks matter
+    @staticmethod
+    def _hash(search_name):
+        return hash(search_name) % 257
+
+
+def check_table(table: RobinHoodTable):
+    mask = table.mask
+    filled = [slot for slot in range(table.capacity) if table.rows[slot] != EMPTY]
+    assert len(filled) == table.count
+    for slot in filled:
+        dist = (slot - table.hashes[slot]) & mask
+        # Robin Hood: walking a cluster, each entry is at most one slot further from home than the previous
+        previous = (slot - 1) & mask
+        if dist:
+            assert table.rows[previous] != EMPTY
+            assert (previous - table.hashes[previous]) & mask >= dist - 1
+        assert table.find_row(table.hashes[slot], table.rows[slot]) == slot
+    return [table.rows[slot] for slot in filled]
+
+
+def check_engine(engine, model):
+    rows = check_table(engine.table)
+    if engine.old_table is not None:
+        rows += check_table(engine.old_table)
+    assert sorted(rows) == list(range(engine.size))
+    assert engine.size == len(model)
+    for name, phone in model.items():
+        contact = engine.search(name)
+        assert contact is not None and contact.phone == phone
+
+
+@pytest.mark.parametrize("factory", [OpenAddressingImpl, CollidingImpl,
+                                     lambda: OpenAddressingImpl(incremental_resize=False)])
+def test_random_writes_across_resizes(factory):
+    rnd = random.Random(11)
+    engine = factory()
+    model = {}
+    saw_resize = False
+    for step in range(4000):
+        name = f"person {rnd.randrange(1500):04d}"
+        if rnd.random() < 0.65:
+            phone = f"555-{step:04d}"
+            assert engine.insert(name, phone, "p@example.com") == (name not in model)
+            model.setdefault(name, phone)
+        else:
+            assert engine.delete(name) == (name in model)
+            model.pop(name, None)
+            assert engine.search(name) is None
+        saw_resize = saw_resize or engine.resizing
+        if step % 500 == 0:
+            check_engine(engine, model)
+    check_engine(engine, model)
+    assert engine.table.count <= engine.capacity * engine.MAX_LOAD
+    if factory is OpenAddressingImpl:
+        assert saw_resize
+
+
+def test_deletes_during_incremental_resize():
+    engine = OpenAddressingImpl(initial_capacity=16)
+    model = {}
+    i = 0
+    while not engine.resizing:
+        model[f"person {i}"] = "555-0000"
+        engine.insert(f"person {i}", "555-0000", "p@example.com")
+        i += 1
+    # Delete from both the draining table and the new one before migration finishes
+    for name in list(model)[::2]:
+        assert engine.delete(name)
+        del model[name]
+        check_engine(engine, model)
+    assert not engine.resizing
+    check_engine(engine, model)
+
+
+def test_backward_shift_leaves_no_gaps():
+    table = RobinHoodTable(8)
+    for row in range(5):
+        table.insert(3, row)  # One cluster, all homed at slot 3
+    table.remove_slot(table.find_row(3, 1))
+    assert [table.rows[(3 + i) & 7] for i in range(4)] == [0, 2, 3, 4]
+    assert table.rows[(3 + 4) & 7] == EMPTY
+    check_table(table)
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from array_ import ArrayImpl, SortedArrayImpl
+from bst import BstImpl
+from columnar import ColumnarImpl
+from hash_map import HashMapImpl
+from helper import Contact, SortedView
+from linked_list import LinkedListImpl
+from open_addressing import OpenAddressingImpl
+from persistent_bst import PersistentBstImpl
+from radix_tree import RadixTreeImpl
+from skip_list import SkipListImpl
+
+ENGINES = [ArrayImpl, SortedArrayImpl, lambda: BstImpl(balance='avl'), ColumnarImpl, HashMapImpl, LinkedListImpl,
+           OpenAddressingImpl, PersistentBstImpl, RadixTreeImpl, SkipListImpl]
+
+
+def all_pages(engine, limit):
+    names, last = [], None
+    while True:
+        page = list(engine.iter_contacts(start_after=last, limit=limit))
+        assert len(page) <= limit
+        if not page:
+            return names
+        names.extend(c.name for c in page)
+        last = page[-1].name
+
+
+@pytest.mark.parametrize("factory", ENGINES)
+def test_pages_follow_writes(factory):
+    rnd = random.Random(4)
+    engine = factory()
+    model = {}
+    for round_ in range(6):
+        # Small and large batches of changes, so both the bisect and the re-sort paths fold them in
+        for _ in range(rnd.choice([5, 40, 300])):
+            name = f"person {rnd.randrange(400):03d}"
+            if rnd.random() < 0.6:
+                engine.insert(name, "555-0000", "p@example.com")
+                model.setdefault(name, "555-0000")
+            else:
+                engine.delete(name)
+                model.pop(name, None)
+        for name in rnd.sample(sorted(model), min(5, len(model))):
+            phone = f"555-{round_:04d}"
+            engine.update(name, phone=phone)
+            model[name] = phone
+        assert all_pages(engine, rnd.choice([1, 7, 50])) == sorted(model)
+        page = list(engine.iter_contacts(limit=len(model)))
+        assert {c.name: c.phone for c in page} == model
+
+
+@pytest.mark.parametrize("factory", ENGINES)
+def test_cursor_between_and_after_names(factory):
+    engine = factory()
+    engine.bulk_insert([(name, "555-0000", "p@example.com") for name in ["b", "d", "f"]])
+    assert [c.name for c in engine.iter_contacts(start_after="c")] == ["d", "f"]
+    assert [c.name for c in engine.iter_contacts(start_after="D", limit=1)] == ["f"]
+    assert list(engine.iter_contacts(start_after="f")) == []
+    engine.insert("e", "555-0000", "p@example.com")
+    engine.delete("f")
+    assert [c.name for c in engine.iter_contacts(start_after="d")] == ["e"]
+
+
+@pytest.mark.parametrize("changes", [2, 100])
+def test_sorted_view_folds_queued_changes(changes):
+    # lookup=identity keeps the view's names visible; 100 changes exceeds MAX_BISECT_CHANGES
+    view = SortedView(lookup=lambda names: names)
+    assert view.page([Contact(name, "1", "x@example.com") for name in "eac"], None, None) == ["a", "c", "e"]
+    added = [f"b{i:03d}" for i in range(changes)]
+    for name in added:
+        view.add_name(name)
+    view.remove("c")
+    view.add_name("x")
+    view.remove("x")  # Added and removed between reads: never reaches the list
+    assert view.page([], None, None) == ["a"] + added + ["e"]
+    assert view.page([], added[-1], 5) == ["e"]
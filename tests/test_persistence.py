@@ -0,0 +1,176 @@
+import os
+
+import pytest
+
+from hash_map import HashMapImpl
+from persistence import PersistentStore
+
+
+def open_store(directory, **kwargs):
+    return PersistentStore(HashMapImpl(), str(directory), compact_every=None, **kwargs)
+
+
+def make_snapshot(directory, count=50):
+    with open_store(directory) as store:
+        store.bulk_insert([(f"Person {i:02d}", f"555-{i:04d}", f"p{i}@example.com") for i in range(count)])
+        store.compact()
+
+
+def names(store):
+    return sorted(c.name for c in store.list_all_contacts())
+
+
+def test_log_replay_restores_writes(tmp_path):
+    with open_store(tmp_path) as store:
+        store.insert("Ann", "555-0001", "ann@example.com")
+        store.insert("Bob", "555-0002", "bob@example.com")
+        store.update("Ann", phone="555-9999")
+        store.delete("Bob")
+        store.bulk_insert([("Cy", "555-0003", "cy@example.com"), ("cy", "555-0004", "dup@example.com")])
+
+    with open_store(tmp_path) as store:
+        assert names(store) == ["ann", "cy"]
+        assert store.search("ann").phone == "555-9999"
+        assert store.search("cy").phone == "555-0003"
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_snapshot_plus_log_tail(tmp_path, lazy):
+    with open_store(tmp_path, lazy=lazy) as store:
+        for i in range(50):
+            store.insert(f"Person {i:02d}", f"555-{i:04d}", f"p{i}@example.com")
+        store.compact()
+        store.delete("Person 00")
+        store.update("Person 01", email="new@example.com")
+        store.insert("Zed", "555-1234", "zed@example.com")
+
+    assert sorted(os.listdir(tmp_path)) == ["contacts.1.log", "contacts.snap"]
+    with open_store(tmp_path, lazy=lazy) as store:
+        assert store.size == 50
+        assert store.search("person 00") is None
+        assert store.search("person 01").email == "new@example.com"
+        assert store.search("zed") is not None
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    with open_store(tmp_path) as store:
+        store.insert("Ann", "555-0001", "ann@example.com")
+        store.insert("Bob", "555-0002", "bob@example.com")
+    log_path = tmp_path / "contacts.0.log"
+    intact = log_path.stat().st_size
+    with open(log_path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+
+    with open_store(tmp_path) as store:
+        assert names(store) == ["ann", "bob"]
+    assert log_path.stat().st_size == intact
+
+
+def test_oversized_field_changes_nothing(tmp_path):
+    huge = "x" * 70_000
+    with open_store(tmp_path) as store:
+        store.insert("Ann", "555-0001", "ann@example.com")
+        with pytest.raises(ValueError):
+            store.insert("Bob", "555-0002", huge)
+        with pytest.raises(ValueError):
+            store.update("Ann", email=huge)
+        with pytest.raises(ValueError):
+            store.bulk_insert([("Cy", "555-0003", "cy@example.com"), ("Di", huge, "di@example.com")])
+        assert names(store) == ["ann"]
+        assert store.search("ann").email == "ann@example.com"
+
+    with open_store(tmp_path) as store:
+        assert names(store) == ["ann"]
+
+
+def test_lazy_open_leaves_snapshot_on_disk(tmp_path):
+    make_snapshot(tmp_path)
+    with open_store(tmp_path) as store:
+        assert store.engine.size == 0
+        assert store.size == 50
+        assert store.search("PERSON 07").phone == "555-0007"
+        assert store.search_many(["person 08", "nobody"])[0].email == "p8@example.com"
+        assert not store.insert("Person 07", "555-1111", "dup@example.com")
+        assert store.engine.size == 0
+
+
+def test_lazy_writes_take_over_snapshot_names(tmp_path):
+    make_snapshot(tmp_path)
+    with open_store(tmp_path) as store:
+        assert store.update("Person 01", phone="555-9999")
+        assert store.delete("Person 02")
+        assert store.insert("Person 02", "555-2222", "again@example.com")
+        assert store.delete("Person 03")
+        assert store.search("person 03") is None
+        result = store.bulk_insert([("Person 04", "1", "x@example.com"), ("Person 99", "2", "y@example.com")])
+        assert result.inserted == 1 and result.rejected == ["Person 04"]
+        assert store.size == 50
+
+    for lazy in (True, False):
+        with open_store(tmp_path, lazy=lazy) as store:
+            assert store.size == 50
+            assert store.search("person 01").phone == "555-9999"
+            assert store.search("person 02").email == "again@example.com"
+            assert store.search("person 03") is None
+            assert store.search("person 99") is not None
+
+
+def test_lazy_listing_and_paging_merge_snapshot_and_engine(tmp_path):
+    make_snapshot(tmp_path, count=20)
+    with open_store(tmp_path) as store:
+        store.delete("Person 05")
+        store.update("Person 06", phone="555-6666")
+        store.insert("Person 10a", "555-0100", "a@example.com")
+        expected = sorted(c.name for c in store.list_all_contacts())
+        assert [c.name for c in store.list_all_contacts(sorted_by_name=True)] == expected
+        assert len(expected) == store.size == 20
+
+        pages, last = [], None
+        while True:
+            page = list(store.iter_contacts(start_after=last, limit=6))
+            if not page:
+                break
+            pages.extend(c.name for c in page)
+            last = page[-1].name
+        assert pages == expected
+        assert sorted(c.name for c in store) == expected
+
+
+def test_lazy_compact_twice(tmp_path):
+    make_snapshot(tmp_path, count=10)
+    with open_store(tmp_path) as store:
+        store.delete("Person 00")
+        store.insert("Zed", "555-1234", "zed@example.com")
+        store.compact()
+        assert store.size == 10
+        store.update("Zed", phone="555-4321")
+        store.delete("Person 01")
+        store.compact()
+        assert store.size == 9
+    with open_store(tmp_path) as store:
+        assert store.size == 9
+        assert store.search("zed").phone == "555-4321"
+        assert store.search("person 01") is None
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_batches_crossing_compact_every_are_not_logged_twice(tmp_path, lazy):
+    contacts = [(f"Person {i:02d}", f"555-{i:04d}", f"p{i}@example.com") for i in range(12)]
+    with open_store(tmp_path, lazy=lazy) as store:
+        store.compact_every = 5
+        store.bulk_insert(contacts)
+
+    with open_store(tmp_path, lazy=lazy) as store:
+        rows = store.list_all_contacts()
+        assert store.size == len(rows) == 12
+        assert len({c.name for c in rows}) == 12
+        store.compact_every = 5
+        store.update_many([(name, "555-9999", None) for name, _, _ in contacts[:7]])
+        store.delete_many([name for name, _, _ in contacts[10:]])
+
+    with open_store(tmp_path, lazy=lazy) as store:
+        rows = store.list_all_contacts()
+        assert store.size == len(rows) == 10
+        assert len({c.name for c in rows}) == 10
+        assert store.search("person 06").phone == "555-9999"
+        assert store.search("person 11") is None
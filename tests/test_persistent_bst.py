@@ -0,0 +1,68 @@
+import random
+
+from persistent_bst import PersistentBstImpl
+
+
+def check_avl(node):
+    # Returns (height, names in order) and asserts the AVL and ordering invariants on the way
+    if node is None:
+        return 0, []
+    left_height, left_names = check_avl(node.left)
+    right_height, right_names = check_avl(node.right)
+    assert abs(left_height - right_height) <= 1
+    assert node.height == 1 + max(left_height, right_height)
+    assert all(name < node.contact.name for name in left_names)
+    assert all(name > node.contact.name for name in right_names)
+    return node.height, left_names + [node.contact.name] + right_names
+
+
+def test_random_writes_keep_avl_invariants_and_snapshots():
+    rnd = random.Random(5)
+    tree = PersistentBstImpl()
+    model = {}
+    snapshots = []
+    for step in range(2000):
+        name = f"person {rnd.randrange(300):03d}"
+        roll = rnd.random()
+        if roll < 0.5:
+            assert tree.insert(name, "555-0000", "p@example.com") == (name not in model)
+            model.setdefault(name, "555-0000")
+        elif roll < 0.7:
+            phone = f"555-{step:04d}"
+            assert tree.update(name, phone=phone) == (name in model)
+            if name in model:
+                model[name] = phone
+        else:
+            assert tree.delete(name) == (name in model)
+            model.pop(name, None)
+        if step % 250 == 0:
+            snapshots.append((tree.snapshot(), dict(model)))
+
+    _, names = check_avl(tree.root)
+    assert names == sorted(model) and tree.size == len(model)
+    for view, expected in snapshots:
+        _, names = check_avl(view.root)
+        assert names == sorted(expected) and view.size == len(expected)
+        assert {c.name: c.phone for c in view} == expected
+
+
+def test_snapshot_during_a_write_sees_a_whole_version():
+    # Secondary index upkeep runs mid-write, after the new version is published
+    tree = PersistentBstImpl(indexed=True)
+    tree.bulk_insert([(f"seed {i}", "555-0000", "s@example.com") for i in range(10)])
+    views = []
+    add, remove = tree.index.add, tree.index.remove
+
+    def snapshot_then(method):
+        def wrapper(*args, **kwargs):
+            views.append(tree.snapshot())
+            return method(*args, **kwargs)
+        return wrapper
+
+    tree.index.add, tree.index.remove = snapshot_then(add), snapshot_then(remove)
+    tree.insert("Extra", "555-0001", "x@example.com")
+    tree.delete("seed 3")
+    tree.update("seed 4", phone="555-0002")
+    assert views
+    for view in views:
+        assert sum(1 for _ in view) == view.size
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from radix_tree import RadixTreeImpl
+
+
+def check_compressed(tree):
+    # Returns every stored name; asserts the tree is fully compressed along the way
+    names = []
+    stack = [(tree.root, '')]
+    while stack:
+        node, prefix = stack.pop()
+        key = prefix + node.label
+        if node is not tree.root:
+            assert node.label
+            if node.contact is None:
+                assert len(node.children) >= 2, f"pass-through node left at {key!r}"
+            else:
+                assert node.contact.name == key
+        if node.contact is not None:
+            names.append(key)
+        for first, child in node.children.items():
+            assert child.label[0] == first
+            stack.append((child, key))
+        if node.ordered is not None:
+            assert node.ordered == [node.children[c] for c in sorted(node.children, reverse=True)]
+    return sorted(names)
+
+
+NAMES = ["ann", "anna", "annabel", "anne", "annette", "bob", "bobby", "bo", "b", "zed"]
+
+
+def test_delete_merges_pass_through_nodes():
+    tree = RadixTreeImpl()
+    for name in NAMES:
+        tree.insert(name, "555-0000", f"{name}@example.com")
+    assert check_compressed(tree) == sorted(NAMES)
+
+    remaining = set(NAMES)
+    for name in ["anna", "bo", "anne", "b", "annette"]:
+        assert tree.delete(name)
+        assert not tree.delete(name)
+        remaining.discard(name)
+        assert check_compressed(tree) == sorted(remaining)
+    assert [c.name for c in tree] == ["ann", "annabel", "bob", "bobby", "zed"]
+    # "annabel" hangs directly off "ann" now that "anna" is gone
+    assert tree.root.children['a'].label == "ann"
+    assert tree.root.children['a'].children['a'].label == "abel"
+
+
+def test_deleting_every_name_empties_the_root():
+    tree = RadixTreeImpl()
+    for name in NAMES:
+        tree.insert(name, "555-0000", f"{name}@example.com")
+    for name in reversed(NAMES):
+        assert tree.delete(name)
+    assert tree.size == 0 and not tree.root.children
+    assert not tree.delete("ann")
+
+
+def test_random_writes_keep_tree_compressed():
+    rnd = random.Random(3)
+    tree = RadixTreeImpl()
+    model = set()
+    for _ in range(3000):
+        name = ''.join(rnd.choice('ab') for _ in range(rnd.randint(1, 6)))
+        if rnd.random() < 0.55:
+            assert tree.insert(name, "555-0000", "p@example.com") == (name not in model)
+            model.add(name)
+        else:
+            assert tree.delete(name) == (name in model)
+            model.discard(name)
+        if rnd.random() < 0.1:
+            list(tree)  # Fill the ordered-children caches so later changes must reset them
+    assert check_compressed(tree) == sorted(model)
+    assert [c.name for c in tree] == sorted(model)
+    assert tree.size == len(model)
+
+
+@pytest.mark.parametrize("prefix, expected", [("ann", ["ann", "annabel"]), ("bo", ["bob", "bobby"]),
+                                              ("x", []), ("", ["ann", "annabel", "bob"])])
+def test_autocomplete_after_deletes(prefix, expected):
+    tree = RadixTreeImpl()
+    for name in NAMES:
+        tree.insert(name, "555-0000", f"{name}@example.com")
+    for name in ["anna", "anne", "annette", "bo", "b"]:
+        tree.delete(name)
+    assert [c.name for c in tree.autocomplete(prefix, k=3)] == expected
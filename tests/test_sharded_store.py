@@ -0,0 +1,39 @@
+import pytest
+
+from sharded_store import ShardedStore
+
+
+@pytest.fixture
+def store():
+    with ShardedStore(workers=2) as store:
+        yield store
+
+
+def test_batch_results_in_input_order(store):
+    names = [f"person{i}" for i in range(20)]
+    store.bulk_insert([(name, f"555-{i:04d}", f"{name}@example.com") for i, name in enumerate(names)])
+    results = store.execute_batch([('search', name) for name in reversed(names)])
+    assert [c.name for c in results] == list(reversed(names))
+
+
+def test_failed_batch_leaves_pipes_in_step(store):
+    names = [f"person{i}" for i in range(20)]
+    store.bulk_insert([(name, "555-0000", f"{name}@example.com") for name in names])
+    # The failing call goes to the first shard read, so the other shard's reply is still pending
+    bad = next(name for name in names if store._shard(name) == 0)
+    others = [name for name in names if store._shard(name) == 1]
+    assert others
+    batch = [('update', bad, '555-1111', None, 'extra-arg')] + [('search', name) for name in others]
+    with pytest.raises(RuntimeError, match="shard operation failed"):
+        store.execute_batch(batch)
+
+    assert store.size == len(names)
+    assert store.search(others[0]).name == others[0]
+    assert store.search(bad).phone == "555-0000"
+
+
+def test_closed_store_refuses_calls():
+    store = ShardedStore(workers=2)
+    store.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        store.search("anyone")
@@ -0,0 +1,40 @@
+import pytest
+
+from workload import WorkloadSpec, generate_trace, preset
+
+CONTACTS = [(f"Person {i}", f"555-{i:04d}", f"person{i}@example.com") for i in range(50)]
+
+
+def test_trace_is_reproducible():
+    spec = preset('Contacts', operations=500, seed=7)
+    assert generate_trace(spec, CONTACTS).operations == generate_trace(spec, CONTACTS).operations
+
+
+def test_updates_and_deletes_target_live_names():
+    spec = WorkloadSpec(read=0, update=0.4, insert=0.2, delete=0.4, operations=1000, seed=3)
+    live = {name for name, _, _ in CONTACTS}
+    for op, name, *_ in generate_trace(spec, CONTACTS).operations:
+        if op == 'insert':
+            assert name not in live
+            live.add(name)
+        else:
+            assert name in live
+            if op == 'delete':
+                live.remove(name)
+
+
+def test_delete_only_mix_that_runs_out_of_names_raises():
+    spec = WorkloadSpec(read=0, update=0, insert=0, delete=1, operations=20, seed=1)
+    with pytest.raises(ValueError, match="ran out of existing names after 2 operations"):
+        generate_trace(spec, CONTACTS[:2])
+
+
+def test_reads_without_misses_over_empty_load_raise():
+    spec = WorkloadSpec(read=1, update=0, insert=0, delete=0, miss_rate=0, operations=10, seed=1)
+    with pytest.raises(ValueError):
+        generate_trace(spec, [])
+
+
+def test_empty_load_with_inserts_still_generates():
+    spec = WorkloadSpec(read=0.5, update=0.2, insert=0.3, delete=0, miss_rate=0, operations=200, seed=1)
+    assert len(generate_trace(spec, []).operations) == 200
@@ -0,0 +1,233 @@
+import json
+import random
+import time
+from bisect import bisect_left
+from itertools import accumulate
+from typing import List, Optional, Dict, Tuple, Any, TextIO
+from benchmark_harness import percentile
+
+OPERATIONS = ('read', 'update', 'insert', 'delete')
+KEY_DISTRIBUTIONS = ('uniform', 'zipf', 'latest')
+
+
+class WorkloadSpec:
+    """
+    Operation mix and key choice for a generated workload, in the style of YCSB.
+
+    Proportions are normalized, so (read=9, update=1) is a 90/10 mix. Reads and updates
+    pick existing keys by key_distribution: 'zipf' (skew = Zipf exponent over a fixed
+    random popularity ranking), 'uniform', or 'latest' (Zipf over insertion recency, so
+    new contacts are the hot ones). miss_rate is the fraction of reads for names that
+    were never inserted. Deletes pick uniformly among existing keys.
+    """
+
+    def __init__(self, read: float = 0.9, update: float = 0.05, insert: float = 0.03, delete: float = 0.02,
+                 key_distribution: str = 'zipf', skew: float = 0.99, miss_rate: float = 0.05,
+                 operations: int = 100_000, seed: Optional[int] = None):
+        if key_distribution not in KEY_DISTRIBUTIONS:
+            raise ValueError(f"key_distribution must be one of {KEY_DISTRIBUTIONS}, got {key_distribution!r}")
+        if min(read, update, insert, delete) < 0 or read + update + insert + delete <= 0:
+            raise ValueError("operation proportions must be non-negative and not all zero")
+        if not 0.0 <= miss_rate <= 1.0:
+            raise ValueError("miss_rate must be in [0, 1]")
+        self.read = read
+        self.update = update
+        self.insert = insert
+        self.delete = delete
+        self.key_distribution = key_distribution
+        self.skew = skew
+        self.miss_rate = miss_rate
+        self.operations = operations
+        self.seed = seed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WorkloadSpec':
+        return cls(**data)
+
+    def __str__(self) -> str:
+        total = self.read + self.update + self.insert + self.delete
+        mix = '/'.join(f"{getattr(self, op) / total:.0%} {op}" for op in OPERATIONS if getattr(self, op))
+        return f"WorkloadSpec({mix}, {self.key_distribution}, miss_rate={self.miss_rate}, ops={self.operations})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+# Standard YCSB core workloads (scans omitted) plus our own contact-book traffic
+PRESETS = {
+    'A (update heavy)': dict(read=0.5, update=0.5, insert=0, delete=0, miss_rate=0.0),
+    'B (read mostly)': dict(read=0.95, update=0.05, insert=0, delete=0, miss_rate=0.0),
+    'C (read only)': dict(read=1.0, update=0, insert=0, delete=0, miss_rate=0.0),
+    'D (read latest)': dict(read=0.95, update=0, insert=0.05, delete=0, key_distribution='latest', miss_rate=0.0),
+    'Contacts': dict(read=0.9, update=0.05, insert=0.03, delete=0.02, miss_rate=0.05)
+}
+
+
+def preset(name: str, **overrides) -> WorkloadSpec:
+    if name not in PRESETS:
+        raise ValueError(f"unknown preset {name!r}; choose from {list(PRESETS)}")
+    return WorkloadSpec(**{**PRESETS[name], **overrides})
+
+
+class Trace:
+    """A fixed workload: contacts to load first, then (op, name, *args) operations in order"""
+
+    def __init__(self, spec: Dict[str, Any], load: List[Tuple[str, str, str]], operations: List[tuple]):
+        self.spec = spec
+        self.load = load
+        self.operations = operations
+
+    def save(self, fileobj: TextIO) -> None:
+        """Write as JSONL: a header line, then one line per loaded contact and per operation"""
+        fileobj.write(json.dumps({'spec': self.spec, 'load': len(self.load),
+                                  'operations': len(self.operations)}) + '\n')
+        for contact in self.load:
+            fileobj.write(json.dumps(contact) + '\n')
+        for operation in self.operations:
+            fileobj.write(json.dumps(operation) + '\n')
+
+    @classmethod
+    def read(cls, fileobj: TextIO) -> 'Trace':
+        header = json.loads(fileobj.readline())
+        load = [tuple(json.loads(fileobj.readline())) for _ in range(header['load'])]
+        operations = [tuple(json.loads(fileobj.readline())) for _ in range(header['operations'])]
+        return cls(header['spec'], load, operations)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+
+def _zipf_cumulative(n: int, skew: float) -> List[float]:
+    return list(accumulate(1.0 / rank ** skew for rank in range(1, n + 1)))
+
+
+def generate_trace(spec: WorkloadSpec, contacts: List[Tuple[str, str, str]]) -> Trace:
+    """
+    Build a reproducible trace for spec over the given initial contacts.
+
+    Generation tracks which names exist after every operation, so updates and deletes
+    in the trace only miss when the spec asks for misses, whatever engine replays it.
+    Raises ValueError if the names run out and the spec has no inserts or misses to
+    produce further operations with.
+    """
+    rnd = random.Random(spec.seed)
+    live = [contact[0] for contact in contacts]  # Existing names, in load order
+    if spec.key_distribution != 'latest':
+        rnd.shuffle(live)  # Popularity rank = position, independent of load order
+    position = {name.strip().lower(): i for i, name in enumerate(live)}
+
+    # The Zipf table covers the initial population; ranks past the live count wrap around
+    cumulative = _zipf_cumulative(max(len(live), 1), spec.skew)
+    op_weights = list(accumulate(getattr(spec, op) for op in OPERATIONS))
+    next_id = 0
+    # Without inserts or misses, an empty live set can never produce another operation
+    needs_live = not spec.insert and not (spec.read and spec.miss_rate)
+
+    def pick() -> str:
+        if spec.key_distribution == 'uniform':
+            return live[rnd.randrange(len(live))]
+        rank = bisect_left(cumulative, rnd.random() * cumulative[-1])
+        if spec.key_distribution == 'latest':
+            return live[-1 - rank % len(live)]
+        return live[rank % len(live)]
+
+    def remove(name: str) -> None:
+        # Swap-remove from the live list (changes one other name's rank)
+        key = name.strip().lower()
+        i = position.pop(key)
+        last = live.pop()
+        if i < len(live):
+            live[i] = last
+            position[last.strip().lower()] = i
+
+    operations = []
+    while len(operations) < spec.operations:
+        op = OPERATIONS[bisect_left(op_weights, rnd.random() * op_weights[-1])]
+        if op == 'insert':
+            name = f"Workload Contact{next_id:08d}"
+            next_id += 1
+            live.append(name)
+            position[name.lower()] = len(live) - 1
+            operations.append(('insert', name, f"{rnd.randint(100, 999)}-{rnd.randint(1000, 9999)}",
+                               f"{name.lower().replace(' ', '.')}@example.com"))
+        elif op == 'read' and rnd.random() < spec.miss_rate:
+            operations.append(('read', f"Missing Contact{rnd.randrange(10 ** 9):09d}"))
+        elif not live:
+            if needs_live:
+                raise ValueError(f"{spec} ran out of existing names after {len(operations)} operations; "
+                                 f"load more contacts or allow inserts or missing reads")
+            continue
+        elif op == 'delete':
+            name = live[rnd.randrange(len(live))]
+            remove(name)
+            operations.append(('delete', name))
+        elif op == 'read':
+            operations.append(('read', pick()))
+        else:
+            operations.append(('update', pick(), f"{rnd.randint(100, 999)}-{rnd.randint(1000, 9999)}"))
+    return Trace(spec.to_dict(), list(contacts), operations)
+
+
+class WorkloadReport:
+    """Throughput and per-operation latency (microseconds) of one trace replay"""
+
+    def __init__(self, elapsed: float, latencies: Dict[str, List[float]], misses: int):
+        self.elapsed = elapsed
+        self.operations = sum(len(values) for values in latencies.values())
+        self.throughput = self.operations / elapsed if elapsed > 0 else 0.0
+        self.misses = misses  # Reads that found nothing
+        self.latency: Dict[str, Dict[str, float]] = {}
+        for op, values in latencies.items():
+            values = sorted(values)
+            self.latency[op] = {
+                'count': len(values),
+                'mean_us': sum(values) / len(values),
+                'p50_us': percentile(values, 50),
+                'p95_us': percentile(values, 95),
+                'p99_us': percentile(values, 99),
+                'max_us': values[-1]
+            }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'throughput_ops_per_s': self.throughput, 'operations': self.operations,
+                'misses': self.misses, 'latency': self.latency}
+
+    def __str__(self) -> str:
+        return f"WorkloadReport(ops={self.operations}, throughput={self.throughput:,.0f} ops/s, misses={self.misses})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def replay(engine, trace: Trace, load: bool = True) -> WorkloadReport:
+    """
+    Run trace against engine and time every operation.
+
+    With load=True the trace's initial contacts are bulk-inserted first (not timed), so the
+    engine should start empty. Each call is timed on its own, which adds clock overhead
+    (tens of ns) to every latency; throughput is measured over the whole replay.
+    """
+    if load:
+        engine.bulk_insert(trace.load)
+
+    methods = {'read': engine.search, 'update': engine.update, 'insert': engine.insert, 'delete': engine.delete}
+    latencies: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+    misses = 0
+    perf_counter = time.perf_counter
+    started = perf_counter()
+    for op, name, *args in trace.operations:
+        start = perf_counter()
+        result = methods[op](name, *args)
+        latencies[op].append((perf_counter() - start) * 1_000_000)
+        if op == 'read' and result is None:
+            misses += 1
+    elapsed = perf_counter() - started
+    return WorkloadReport(elapsed, {op: values for op, values in latencies.items() if values}, misses)
+
+
+def run_workload(engine, spec: WorkloadSpec, contacts: List[Tuple[str, str, str]]) -> WorkloadReport:
+    """Generate a trace for spec and replay it against an empty engine"""
+    return replay(engine, generate_trace(spec, contacts))